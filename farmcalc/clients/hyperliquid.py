@@ -1,6 +1,10 @@
 """Hyperliquid API client."""
 
+import asyncio
 import logging
+import math
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Dict, List, Optional, Tuple
 
 import httpx
@@ -9,6 +13,9 @@ from ..settings import Settings
 
 logger = logging.getLogger(__name__)
 
+_HTTP_TIMEOUT_SEC = 10.0
+_MAX_CONCURRENT_L2 = 8  # In-flight l2Book requests per batch
+
 
 def _extract_funding(ctx: Dict) -> float:
     """Extract funding value from context, handling different formats.
@@ -68,7 +75,14 @@ class HyperliquidClient:
     def __init__(self, settings: Settings):
         """Initialize client with settings."""
         self.settings = settings
-        self.client = httpx.Client(timeout=10.0)
+        self.client = httpx.Client(timeout=_HTTP_TIMEOUT_SEC)
+        
+        # Async side for concurrent L2 fetches: one event loop on a daemon
+        # thread, with an AsyncClient kept alive across ticks
+        self.async_client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
     
     def fetch_market_data(self) -> Tuple[List[Dict], List[Dict]]:
         """Fetch universe and asset contexts from Hyperliquid API."""
@@ -174,6 +188,17 @@ class HyperliquidClient:
         
         return coins
     
+    def _parse_l2_book(self, coin: str, data: Dict) -> Optional[Dict]:
+        """Turn an l2Book response into best bid/ask, logging unknown shapes."""
+        from ..services.pricing import parse_best_bid_ask
+        
+        result = parse_best_bid_ask(data)
+        if result:
+            return result
+        
+        logger.warning(f"Could not parse L2 book structure for {coin}")
+        return None
+    
     def get_l2_book(self, coin: str) -> Optional[Dict]:
         """Fetch L2 order book for a coin and return best bid/ask."""
         try:
@@ -182,18 +207,113 @@ class HyperliquidClient:
                 json={"type": "l2Book", "coin": coin}
             )
             response.raise_for_status()
-            data = response.json()
-            
-            # Parse best bid/ask
-            from ..services.pricing import parse_best_bid_ask
-            
-            result = parse_best_bid_ask(data)
-            if result:
-                return result
-            
-            logger.warning(f"Could not parse L2 book structure for {coin}")
+            return self._parse_l2_book(coin, response.json())
+        except Exception as e:
+            logger.error(f"Error fetching L2 book for {coin}: {e}")
             return None
+    
+    async def get_l2_book_async(self, coin: str) -> Optional[Dict]:
+        """Async variant of get_l2_book on the shared AsyncClient."""
+        if self.async_client is None:
+            self.async_client = httpx.AsyncClient(timeout=_HTTP_TIMEOUT_SEC)
+        try:
+            response = await self.async_client.post(
+                self.settings.hyperliquid_api_url,
+                json={"type": "l2Book", "coin": coin}
+            )
+            response.raise_for_status()
+            return self._parse_l2_book(coin, response.json())
         except Exception as e:
             logger.error(f"Error fetching L2 book for {coin}: {e}")
             return None
-
+    
+    async def get_l2_books_async(
+        self,
+        coins: List[str],
+        results: Optional[List[Optional[Dict]]] = None,
+    ) -> List[Optional[Dict]]:
+        """Fetch L2 books for several coins with overlapping requests.
+        
+        At most _MAX_CONCURRENT_L2 requests are in flight at once. Each book
+        is written into results as soon as it arrives, so a caller that gives
+        up early still sees the ones that completed.
+        """
+        if results is None:
+            results = [None] * len(coins)
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_L2)
+        
+        async def fetch(index: int, coin: str):
+            async with semaphore:
+                results[index] = await self.get_l2_book_async(coin)
+        
+        await asyncio.gather(*(fetch(i, coin) for i, coin in enumerate(coins)))
+        return results
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop used for async fetches, once."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="hl-async", daemon=True)
+                thread.start()
+                self._loop = loop
+                self._loop_thread = thread
+        return self._loop
+    
+    def close(self):
+        """Close the AsyncClient and stop the background event loop.
+        
+        The synchronous client is left open since it is shared with the API;
+        a later batch fetch starts a fresh loop and AsyncClient.
+        """
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+            thread, self._loop_thread = self._loop_thread, None
+        if loop is None:
+            return
+        
+        async_client, self.async_client = self.async_client, None
+        if async_client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(async_client.aclose(), loop).result(
+                    timeout=_HTTP_TIMEOUT_SEC
+                )
+            except Exception as e:
+                logger.warning(f"Error closing async Hyperliquid client: {e}")
+        
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=_HTTP_TIMEOUT_SEC)
+        if not loop.is_running():
+            loop.close()
+    
+    def get_l2_books_batch(self, coins: List[str]) -> List[Optional[Dict]]:
+        """Fetch L2 books for several coins concurrently.
+        
+        The info endpoint has no multi-coin l2Book request, so the requests
+        are issued concurrently on a background event loop and gathered,
+        making a tick cost roughly one round trip instead of one per coin.
+        
+        Args:
+            coins: Coin names to fetch
+        
+        Returns:
+            List aligned with coins; None where a book could not be fetched
+            or did not arrive in time
+        """
+        if len(coins) <= 1:
+            return [self.get_l2_book(coin) for coin in coins]
+        
+        results: List[Optional[Dict]] = [None] * len(coins)
+        future = asyncio.run_coroutine_threadsafe(
+            self.get_l2_books_async(coins, results), self._ensure_loop()
+        )
+        # One client timeout per wave of requests the semaphore lets through
+        waves = math.ceil(len(coins) / _MAX_CONCURRENT_L2)
+        try:
+            return future.result(timeout=_HTTP_TIMEOUT_SEC * waves)
+        except FutureTimeoutError:
+            future.cancel()
+            missing = [coin for coin, book in zip(coins, results) if book is None]
+            logger.warning(f"Timed out fetching L2 books for {', '.join(missing)}")
+            return list(results)
@@ -12,7 +12,7 @@ class FundingKind(str, Enum):
     EIGHT_HOUR = "8h"
 
 
-@dataclass
+@dataclass(slots=True)
 class Plan:
     """Farming plan configuration."""
     deposit: float = 1000.0
@@ -22,9 +22,13 @@ class Plan:
     target_frozen: float = 0.0
     unfreeze_factor: float = 1.75
     level_factor: float = 0.25
+    
+    def to_dict(self) -> Dict:
+        """Field dict for JSON serialization."""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
-@dataclass
+@dataclass(slots=True)
 class Stats:
     """Farming statistics."""
     total_volume_done: float = 0.0
@@ -32,9 +36,13 @@ class Stats:
     total_funding_pnl: float = 0.0
     frozen_remaining: float = 0.0
     estimated_fomo_minted: float = 0.0
+    
+    def to_dict(self) -> Dict:
+        """Field dict for JSON serialization."""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """A trade record."""
     id: str
@@ -59,6 +67,10 @@ class Trade:
     open_fee_mode: str = "maker"
     close_fee_mode: str = "maker"
     actual_close_fee_mode: Optional[str] = None
+    
+    def to_dict(self) -> Dict:
+        """Field dict for JSON serialization."""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 class ProposalStatus(str, Enum):
@@ -69,7 +81,7 @@ class ProposalStatus(str, Enum):
     EXPIRED = "expired"
 
 
-@dataclass
+@dataclass(slots=True)
 class Proposal:
     """A trade proposal that can be accepted/rejected via Telegram."""
     id: str
@@ -92,10 +104,19 @@ class Proposal:
     expires_at: str
     message_id: Optional[int] = None
     chat_id: Optional[int] = None
-    status: str = ProposalStatus.PENDING.value
+    status: ProposalStatus = ProposalStatus.PENDING
     decided_at_utc: Optional[str] = None  # When decision was made
     decided_by_user_id: Optional[int] = None  # Telegram user ID who decided
     decision: Optional[str] = None  # "ACCEPT" or "REJECT"
+    
+    def __post_init__(self):
+        # Stored state holds the plain string value; ProposalStatus is a str
+        # subclass, so the member serializes back to the same string
+        self.status = ProposalStatus(self.status)
+    
+    def to_dict(self) -> Dict:
+        """Shallow field dict for JSON; metrics, prices etc. are shared, not copied."""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 @dataclass
@@ -107,9 +128,10 @@ class State:
     proposals: Dict[str, Proposal] = field(default_factory=dict)  # proposal_id -> Proposal
     watcher_enabled: bool = True
     schema_version: int = 2  # Bumped for proposals support
+    next_expiry_ts: Optional[float] = None  # earliest pending expiry (epoch s), None if nothing pending
 
 
-@dataclass
+@dataclass(slots=True)
 class WatchThresholds:
     """Thresholds for safe entry evaluation."""
     spread_max_bps: float = 3.0
@@ -117,9 +139,13 @@ class WatchThresholds:
     oracle_dev_max_bps: float = 10.0
     funding_max: float = 0.00002  # For hourly, adjust for 8h
     min_day_ntl_vlm: float = 0.0
+    
+    def to_dict(self) -> Dict:
+        """Field dict for JSON serialization."""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
-@dataclass
+@dataclass(slots=True)
 class WatchConfig:
     """Watch mode configuration."""
     enabled: bool = False
@@ -133,6 +159,12 @@ class WatchConfig:
     cooldown_sec: float = 300.0  # 5 minutes default
     sentiment_enabled: bool = False
     telegram_enabled: bool = True
+    
+    def to_dict(self) -> Dict:
+        """Field dict for JSON with thresholds flattened to a plain dict."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["thresholds"] = self.thresholds.to_dict()
+        return data
 
 
 @dataclass
@@ -147,6 +179,30 @@ class WatchState:
     enabled: bool = True  # Controls whether watcher should poll/alert
     muted_coins: Dict[str, float] = field(default_factory=dict)  # key: coin, value: unmute timestamp
     last_proposal_time: float = 0.0  # For spam guard
+    alert_minute_buckets: List[int] = field(default_factory=lambda: [0] * 60)  # ring buffer, slot = minute % 60
+    last_bucket_minute: int = 0  # epoch minute of the newest bucket
+    
+    def record_alert(self, ts: float):
+        """Count an alert sent at ts in the per-minute ring buffer."""
+        minute = int(ts // 60)
+        if self.last_bucket_minute - minute >= 60:
+            return  # older than the window
+        buckets = self.alert_minute_buckets
+        if minute - self.last_bucket_minute >= 60:
+            buckets[:] = [0] * 60
+        else:
+            for m in range(self.last_bucket_minute + 1, minute + 1):
+                buckets[m % 60] = 0
+        if minute > self.last_bucket_minute:
+            self.last_bucket_minute = minute
+        buckets[minute % 60] += 1
+    
+    def alerts_last_hour(self, now: float) -> int:
+        """Number of alerts in the last 60 minute buckets, without mutating state."""
+        newest = self.last_bucket_minute
+        oldest = max(int(now // 60), newest) - 59
+        buckets = self.alert_minute_buckets
+        return sum(buckets[m % 60] for m in range(oldest, newest + 1))
 
 
 @dataclass
@@ -25,6 +25,8 @@ from .scoring import (
     calculate_spread_bps,
     calculate_mark_deviation_bps,
     calculate_oracle_deviation_bps,
+    calculate_spread_bps_batch,
+    calculate_deviation_bps_batch,
     calculate_component_scores,
     calculate_total_score,
 )
@@ -49,6 +51,8 @@ __all__ = [
     "calculate_spread_bps",
     "calculate_mark_deviation_bps",
     "calculate_oracle_deviation_bps",
+    "calculate_spread_bps_batch",
+    "calculate_deviation_bps_batch",
     "calculate_component_scores",
     "calculate_total_score",
     "FillModelService",
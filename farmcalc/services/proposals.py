@@ -1,14 +1,40 @@
 """Proposal management service."""
 
 import logging
+import time
 from datetime import datetime, timezone, timedelta
+from itertools import islice
 from typing import Dict, Optional, Tuple
 
-from ..models.domain import Proposal, ProposalStatus, State, Trade
+from ..models.domain import FundingKind, Proposal, ProposalStatus, State, Trade
 from ..settings import Settings
+from .calc import calculate_funding_pnl
 
 logger = logging.getLogger(__name__)
 
+# Static inline-keyboard entries shared by every proposal message
+_CONTROL_ROW = [
+    {"text": "⏸ Pause", "callback_data": "PAUSE"},
+    {"text": "▶️ Resume", "callback_data": "RESUME"},
+]
+_NEXT_BUTTON = {"text": "🔄 Next", "callback_data": "NEXT"}
+
+
+def _now_iso() -> str:
+    """Return the current UTC time as a full-precision ISO-8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp, accepting a trailing "Z" for UTC.
+    
+    Our own timestamps come from ``isoformat()`` and never carry "Z", so the
+    suffix is only rewritten when actually present.
+    """
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
 
 def create_proposal_from_snapshot(
     snapshot: Dict,
@@ -88,7 +114,7 @@ def create_proposal_from_snapshot(
         funding_hourly=funding_hourly,
         created_at=now.isoformat(),
         expires_at=expires_at.isoformat(),
-        status=ProposalStatus.PENDING.value,
+        status=ProposalStatus.PENDING,
     )
 
 
@@ -103,53 +129,61 @@ def format_proposal_message(proposal: Proposal, settings: Settings) -> Tuple[str
         Tuple of (message_text, reply_markup_dict)
     """
     now = datetime.now(timezone.utc)
-    expires = datetime.fromisoformat(proposal.expires_at.replace("Z", "+00:00"))
+    expires = _parse_iso(proposal.expires_at)
     expires_in = int((expires - now).total_seconds() / 60)
     
-    msg_parts = [
+    prices = proposal.suggested_prices
+    offsets = proposal.offsets
+    fill_probs = proposal.fill_probs
+    metrics = proposal.metrics
+    open_px = prices.get("open_limit_px", 0)
+    close_px = prices.get("close_limit_px", 0)
+    best_bid = prices.get("best_bid", 0)
+    best_ask = prices.get("best_ask", 0)
+    notional = proposal.margin * proposal.leverage
+    reasons = ", ".join(islice(proposal.reasons, 3)) if proposal.reasons else "All metrics OK"
+    
+    msg_parts = (
         f"<b>📊 Trade Proposal: {proposal.coin} {proposal.side}</b>",
         f"<code>ID: {proposal.id}</code>",
         "",
         f"<b>Score:</b> {proposal.score:.0f}/100",
-        f"<b>Reasons:</b> {', '.join(proposal.reasons[:3]) if proposal.reasons else 'All metrics OK'}",
+        f"<b>Reasons:</b> {reasons}",
         "",
         "<b>Suggested Limits:</b>",
-        f"Open: ${proposal.suggested_prices.get('open_limit_px', 0):.4f}",
-        f"  (offset: {proposal.offsets.get('open_offset_bps', 0):.1f} bps, fill prob: {proposal.fill_probs.get('open_fill_prob', 0):.1%})",
-        f"Close: ${proposal.suggested_prices.get('close_limit_px', 0):.4f}",
-        f"  (offset: {proposal.offsets.get('close_offset_bps', 0):.1f} bps, fill prob: {proposal.fill_probs.get('close_fill_prob', 0):.1%})",
+        f"Open: ${open_px:.4f}",
+        f"  (offset: {offsets.get('open_offset_bps', 0):.1f} bps, fill prob: {fill_probs.get('open_fill_prob', 0):.1%})",
+        f"Close: ${close_px:.4f}",
+        f"  (offset: {offsets.get('close_offset_bps', 0):.1f} bps, fill prob: {fill_probs.get('close_fill_prob', 0):.1%})",
         "",
         "<b>Parameters:</b>",
         f"Margin: ${proposal.margin:.2f} | Leverage: {proposal.leverage}x",
-        f"Notional: ${proposal.margin * proposal.leverage:,.2f} | Hold: {proposal.hold_min} min",
+        f"Notional: ${notional:,.2f} | Hold: {proposal.hold_min} min",
         f"Fee Mode: {proposal.fee_mode.upper()}",
         "",
         "<b>Key Metrics:</b>",
-        f"Spread: {proposal.metrics.get('spread_bps', 0):.2f} bps",
-        f"Oracle Dev: {proposal.metrics.get('oracle_dev_bps', 0):.2f} bps",
+        f"Spread: {metrics.get('spread_bps', 0):.2f} bps",
+        f"Oracle Dev: {metrics.get('oracle_dev_bps', 0):.2f} bps",
         f"Funding (1h): {proposal.funding_hourly:.6f}",
-        f"24h Volume: ${proposal.metrics.get('liquidity', 0):,.0f}",
-        f"Bid: ${proposal.suggested_prices.get('best_bid', 0):.4f} | Ask: ${proposal.suggested_prices.get('best_ask', 0):.4f}",
+        f"24h Volume: ${metrics.get('liquidity', 0):,.0f}",
+        f"Bid: ${best_bid:.4f} | Ask: ${best_ask:.4f}",
         "",
         f"<i>Expires: {expires.strftime('%H:%M:%S')} UTC ({expires_in} min) | Created: {proposal.created_at[:19]} UTC</i>",
         "",
         "<i>⚠️ Paper-only. No trading executed.</i>",
-    ]
+    )
     
-    # Inline keyboard with improved buttons
+    # Inline keyboard: only the decision and mute rows depend on the proposal
     reply_markup = {
         "inline_keyboard": [
             [
                 {"text": "✅ Accept", "callback_data": f"ACCEPT:{proposal.id}"},
                 {"text": "❌ Reject", "callback_data": f"REJECT:{proposal.id}"},
             ],
-            [
-                {"text": "⏸ Pause", "callback_data": "PAUSE"},
-                {"text": "▶️ Resume", "callback_data": "RESUME"},
-            ],
+            _CONTROL_ROW,
             [
                 {"text": f"🔕 Mute {proposal.coin} 60m", "callback_data": f"MUTE:{proposal.coin}:60"},
-                {"text": "🔄 Next", "callback_data": "NEXT"},
+                _NEXT_BUTTON,
             ],
         ]
     }
@@ -179,25 +213,26 @@ def accept_proposal(
         logger.warning(f"Proposal {proposal_id} not found")
         return None
     
-    # Idempotency check: if already decided, return None
-    if proposal.status != ProposalStatus.PENDING.value:
-        logger.info(f"Proposal {proposal_id} already {proposal.status}, ignoring duplicate accept")
+    # Idempotency check: if already decided, return None before any other work
+    if proposal.status is not ProposalStatus.PENDING:
+        logger.info(f"Proposal {proposal_id} already {proposal.status.value}, ignoring duplicate accept")
         return None
     
     # Check expiry
     now = datetime.now(timezone.utc)
-    expires = datetime.fromisoformat(proposal.expires_at.replace("Z", "+00:00"))
+    now_iso = now.isoformat()
+    expires = _parse_iso(proposal.expires_at)
     if now > expires:
-        proposal.status = ProposalStatus.EXPIRED.value
-        proposal.decided_at_utc = now.isoformat()
+        proposal.status = ProposalStatus.EXPIRED
+        proposal.decided_at_utc = now_iso
         proposal.decided_by_user_id = actor_user_id
         proposal.decision = "EXPIRED"
         logger.warning(f"Proposal {proposal_id} expired")
         return None
     
     # Update proposal with decision tracking
-    proposal.status = ProposalStatus.ACCEPTED.value
-    proposal.decided_at_utc = now.isoformat()
+    proposal.status = ProposalStatus.ACCEPTED
+    proposal.decided_at_utc = now_iso
     proposal.decided_by_user_id = actor_user_id
     proposal.decision = "ACCEPT"
     
@@ -216,9 +251,6 @@ def accept_proposal(
     expected_fees = open_fee + close_fee
     
     # Calculate funding PnL (simplified)
-    from .calc import calculate_funding_pnl
-    from ..models.domain import FundingKind
-    
     funding_kind = FundingKind.HOURLY if proposal.funding_kind == "hourly" else FundingKind.EIGHT_HOUR
     expected_funding_pnl = calculate_funding_pnl(
         proposal.side,
@@ -235,7 +267,7 @@ def accept_proposal(
         leverage=proposal.leverage,
         margin=proposal.margin,
         notional=notional,
-        open_timestamp=now.isoformat(),
+        open_timestamp=now_iso,
         planned_hold_min=proposal.hold_min,
         expected_fees=expected_fees,
         expected_funding_pnl=expected_funding_pnl,
@@ -274,14 +306,13 @@ def reject_proposal(
         return False
     
     # Idempotency check
-    if proposal.status != ProposalStatus.PENDING.value:
-        logger.info(f"Proposal {proposal_id} already {proposal.status}, ignoring duplicate reject")
+    if proposal.status is not ProposalStatus.PENDING:
+        logger.info(f"Proposal {proposal_id} already {proposal.status.value}, ignoring duplicate reject")
         return False
     
     # Update proposal with decision tracking
-    now = datetime.now(timezone.utc)
-    proposal.status = ProposalStatus.REJECTED.value
-    proposal.decided_at_utc = now.isoformat()
+    proposal.status = ProposalStatus.REJECTED
+    proposal.decided_at_utc = _now_iso()
     proposal.decided_by_user_id = actor_user_id
     proposal.decision = "REJECT"
     logger.info(f"Proposal {proposal_id} rejected by user {actor_user_id}")
@@ -302,10 +333,10 @@ def expire_proposals(state: State) -> int:
     expired_count = 0
     
     for proposal in state.proposals.values():
-        if proposal.status == ProposalStatus.PENDING.value:
-            expires = datetime.fromisoformat(proposal.expires_at.replace("Z", "+00:00"))
+        if proposal.status is ProposalStatus.PENDING:
+            expires = _parse_iso(proposal.expires_at)
             if now > expires:
-                proposal.status = ProposalStatus.EXPIRED.value
+                proposal.status = ProposalStatus.EXPIRED
                 expired_count += 1
     
     if expired_count > 0:
@@ -1,8 +1,9 @@
 """Score-based safe entry evaluation with explainability."""
 
+import heapq
 import logging
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from ..models.domain import WatchConfig
 
@@ -51,6 +52,21 @@ class ScoreThresholds:
     depth_good: float = 10000.0  # top-of-book depth
 
 
+# Shared defaults so evaluate_safe_entry does not rebuild them per coin
+_DEFAULT_WEIGHTS = ScoreWeights()
+_DEFAULT_THRESHOLDS = ScoreThresholds()
+
+# (component attribute, metric key, reason template) for limiting-factor reasons
+_FACTOR_SPECS = (
+    ("spread_score", "spread_bps", "spread high ({:.2f} bps, score: {:.1f})"),
+    ("mark_dev_score", "mark_dev_bps", "mark deviation high ({:.2f} bps, score: {:.1f})"),
+    ("oracle_dev_score", "oracle_dev_bps", "oracle deviation high ({:.2f} bps, score: {:.1f})"),
+    ("funding_score", "funding_abs", "funding high ({:.6f}, score: {:.1f})"),
+    ("liquidity_score", "liquidity", "liquidity low (${:,.0f}, score: {:.1f})"),
+    ("depth_score", "depth_top", "depth low (${:,.0f}, score: {:.1f})"),
+)
+
+
 @dataclass
 class SafeEntryScore:
     """Complete safe entry score with explainability."""
@@ -109,6 +125,40 @@ def calculate_oracle_deviation_bps(oracle_px: float, mid_px: float) -> float:
     return abs(oracle_px - mid_px) / mid_px * 10000
 
 
+def calculate_spread_bps_batch(best_bids: Sequence[float], best_asks: Sequence[float]) -> List[float]:
+    """Spread in basis points for aligned bid/ask columns.
+    
+    Args:
+        best_bids: Best bid per coin
+        best_asks: Best ask per coin, aligned with best_bids
+    
+    Returns:
+        Spread in basis points per coin (9999.0 where mid <= 0)
+    """
+    return [
+        (ask - bid) / ((bid + ask) / 2.0) * 10000 if bid + ask > 0 else 9999.0
+        for bid, ask in zip(best_bids, best_asks)
+    ]
+
+
+def calculate_deviation_bps_batch(prices: Sequence[float], mids: Sequence[float]) -> List[float]:
+    """Absolute price-vs-mid deviation in basis points for aligned columns.
+    
+    Batch form of calculate_mark_deviation_bps / calculate_oracle_deviation_bps.
+    
+    Args:
+        prices: Mark or oracle price per coin
+        mids: Mid price per coin, aligned with prices
+    
+    Returns:
+        Deviation in basis points per coin (9999.0 where mid <= 0)
+    """
+    return [
+        abs(px - mid) / mid * 10000 if mid > 0 else 9999.0
+        for px, mid in zip(prices, mids)
+    ]
+
+
 def _linear_score(value: float, good_threshold: float, bad_threshold: float) -> float:
     """Calculate linear score between good (100) and bad (0) thresholds.
     
@@ -242,52 +292,50 @@ def _get_limiting_factors(
     Returns:
         List of reason strings
     """
-    factors = []
-    
-    if components.spread_score < threshold:
-        factors.append(f"spread high ({metrics.get('spread_bps', 0):.2f} bps)")
-    if components.mark_dev_score < threshold:
-        factors.append(f"mark deviation high ({metrics.get('mark_dev_bps', 0):.2f} bps)")
-    if components.oracle_dev_score < threshold:
-        factors.append(f"oracle deviation high ({metrics.get('oracle_dev_bps', 0):.2f} bps)")
-    if components.funding_score < threshold:
-        factors.append(f"funding high ({metrics.get('funding_abs', 0):.6f})")
-    if components.liquidity_score < threshold:
-        factors.append(f"liquidity low (${metrics.get('liquidity', 0):,.0f})")
-    if components.depth_score < threshold:
-        factors.append(f"depth low (${metrics.get('depth_top', 0):,.0f})")
-    
-    # Sort by score (lowest first) and return top 3
-    score_map = {
-        "spread": components.spread_score,
-        "mark_dev": components.mark_dev_score,
-        "oracle_dev": components.oracle_dev_score,
-        "funding": components.funding_score,
-        "liquidity": components.liquidity_score,
-        "depth": components.depth_score,
-    }
+    candidates = []
+    for attr, metric_key, template in _FACTOR_SPECS:
+        score = getattr(components, attr)
+        if score < threshold:
+            candidates.append((score, template, metric_key))
+    
+    # Lowest scores first, top 3 only
+    return [
+        template.format(metrics.get(metric_key, 0), score)
+        for score, template, metric_key in heapq.nsmallest(3, candidates, key=lambda c: c[0])
+    ]
+
+
+def _sum_level_sizes(levels: List, top_k: int) -> float:
+    """Sum order sizes over the first top_k levels of one book side.
     
-    sorted_factors = sorted(
-        [(k, v) for k, v in score_map.items() if v < threshold],
-        key=lambda x: x[1]
-    )[:3]
-    
-    reasons = []
-    for factor, score in sorted_factors:
-        if factor == "spread":
-            reasons.append(f"spread high ({metrics.get('spread_bps', 0):.2f} bps, score: {score:.1f})")
-        elif factor == "mark_dev":
-            reasons.append(f"mark deviation high ({metrics.get('mark_dev_bps', 0):.2f} bps, score: {score:.1f})")
-        elif factor == "oracle_dev":
-            reasons.append(f"oracle deviation high ({metrics.get('oracle_dev_bps', 0):.2f} bps, score: {score:.1f})")
-        elif factor == "funding":
-            reasons.append(f"funding high ({metrics.get('funding_abs', 0):.6f}, score: {score:.1f})")
-        elif factor == "liquidity":
-            reasons.append(f"liquidity low (${metrics.get('liquidity', 0):,.0f}, score: {score:.1f})")
-        elif factor == "depth":
-            reasons.append(f"depth low (${metrics.get('depth_top', 0):,.0f}, score: {score:.1f})")
-    
-    return reasons[:3]
+    The level layout is normally the same for a whole side, so it is detected
+    once from the first entry. A mixed or malformed side falls back to a
+    per-level check that skips levels it cannot read.
+    
+    Args:
+        levels: Book side as [px, sz] pairs or {"px", "sz"} dicts
+        top_k: Number of levels to sum
+    
+    Returns:
+        Total size across the levels
+    """
+    head = levels[:top_k]
+    if not head:
+        return 0.0
+    try:
+        if isinstance(head[0], dict):
+            return sum(float(level.get("sz", 0)) for level in head)
+        return sum(float(level[1]) for level in head if len(level) >= 2)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        pass
+    
+    total = 0.0
+    for level in head:
+        if isinstance(level, (list, tuple)) and len(level) >= 2:
+            total += float(level[1])
+        elif isinstance(level, dict):
+            total += float(level.get("sz", 0))
+    return total
 
 
 def _calculate_depth_top(l2_book: Dict, top_k: int = 3) -> float:
@@ -304,23 +352,11 @@ def _calculate_depth_top(l2_book: Dict, top_k: int = 3) -> float:
     depth = 0.0
     
     # If we have levels structure
-    if "levels" in l2_book:
-        levels = l2_book["levels"]
-        if isinstance(levels, list) and len(levels) >= 2:
-            bids = levels[0] if isinstance(levels[0], list) else []
-            asks = levels[1] if isinstance(levels[1], list) else []
-            
-            for i in range(min(top_k, len(bids))):
-                if isinstance(bids[i], (list, tuple)) and len(bids[i]) >= 2:
-                    depth += float(bids[i][1])  # size is second element
-                elif isinstance(bids[i], dict):
-                    depth += float(bids[i].get("sz", 0))
-            
-            for i in range(min(top_k, len(asks))):
-                if isinstance(asks[i], (list, tuple)) and len(asks[i]) >= 2:
-                    depth += float(asks[i][1])
-                elif isinstance(asks[i], dict):
-                    depth += float(asks[i].get("sz", 0))
+    levels = l2_book.get("levels")
+    if isinstance(levels, list) and len(levels) >= 2:
+        bids = levels[0] if isinstance(levels[0], list) else []
+        asks = levels[1] if isinstance(levels[1], list) else []
+        depth = _sum_level_sizes(bids, top_k) + _sum_level_sizes(asks, top_k)
     
     # Fallback: use a default if depth not available
     if depth == 0.0:
@@ -382,9 +418,9 @@ def evaluate_safe_entry(
     
     # Use defaults if not provided
     if weights is None:
-        weights = ScoreWeights()
+        weights = _DEFAULT_WEIGHTS
     if thresholds is None:
-        thresholds = ScoreThresholds()
+        thresholds = _DEFAULT_THRESHOLDS
     
     # Calculate component scores
     components = calculate_component_scores(
@@ -395,45 +431,9 @@ def evaluate_safe_entry(
     # Calculate total score
     total_score = calculate_total_score(components, weights)
     
-    # Build metrics dict
-    metrics = {
-        "spread_bps": spread_bps,
-        "mark_dev_bps": mark_dev_bps,
-        "oracle_dev_bps": oracle_dev_bps,
-        "funding": funding,
-        "funding_abs": funding_abs,
-        "funding_hourly": funding_hourly,
-        "liquidity": liquidity,
-        "depth_top": depth_top,
-        "mark_px": mark_px,
-        "mid_px": mid,
-        "oracle_px": oracle_px,
-        "best_bid": best_bid,
-        "best_ask": best_ask,
-    }
-    
     # Determine if passed
     passed = total_score >= score_threshold
     
-    # Get limiting factors
-    reasons = _get_limiting_factors(components, metrics, score_threshold) if not passed else []
-    
-    # If passed, add positive reasons
-    if passed:
-        reasons = []
-        if components.spread_score >= score_threshold:
-            reasons.append("spread ok")
-        if components.mark_dev_score >= score_threshold:
-            reasons.append("mark ok")
-        if components.oracle_dev_score >= score_threshold:
-            reasons.append("oracle ok")
-        if components.funding_score >= score_threshold:
-            reasons.append("funding ok")
-        if components.liquidity_score >= score_threshold:
-            reasons.append("liquidity ok")
-        if components.depth_score >= score_threshold:
-            reasons.append("depth ok")
-    
     # Calculate safe sides with limit prices (if passed)
     safe_sides = []
     if passed:
@@ -465,8 +465,41 @@ def evaluate_safe_entry(
                 "best_ask": best_ask,
             })
     
-    # Add safe_sides to metrics for compatibility
-    metrics["safe_sides"] = safe_sides
+    # Build metrics dict (safe_sides included for compatibility)
+    metrics = {
+        "spread_bps": spread_bps,
+        "mark_dev_bps": mark_dev_bps,
+        "oracle_dev_bps": oracle_dev_bps,
+        "funding": funding,
+        "funding_abs": funding_abs,
+        "funding_hourly": funding_hourly,
+        "liquidity": liquidity,
+        "depth_top": depth_top,
+        "mark_px": mark_px,
+        "mid_px": mid,
+        "oracle_px": oracle_px,
+        "best_bid": best_bid,
+        "best_ask": best_ask,
+        "safe_sides": safe_sides,
+    }
+    
+    if passed:
+        # Positive reasons for components that cleared the threshold
+        reasons = []
+        if components.spread_score >= score_threshold:
+            reasons.append("spread ok")
+        if components.mark_dev_score >= score_threshold:
+            reasons.append("mark ok")
+        if components.oracle_dev_score >= score_threshold:
+            reasons.append("oracle ok")
+        if components.funding_score >= score_threshold:
+            reasons.append("funding ok")
+        if components.liquidity_score >= score_threshold:
+            reasons.append("liquidity ok")
+        if components.depth_score >= score_threshold:
+            reasons.append("depth ok")
+    else:
+        reasons = _get_limiting_factors(components, metrics, score_threshold)
     
     return SafeEntryScore(
         total_score=total_score,
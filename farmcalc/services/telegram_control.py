@@ -1,12 +1,14 @@
 """Telegram update handling and control plane (single-user)."""
 
+import heapq
 import logging
 import time
-from datetime import datetime, timezone
-from typing import Dict, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 from ..clients.telegram import TelegramClient
-from ..models.domain import ProposalStatus, State, WatchState
+from ..models.domain import ProposalStatus, WatchState
 from ..services.proposals import (
     accept_proposal,
     expire_proposals,
@@ -18,6 +20,50 @@ from ..storage.state_store import StateStore, WatchStateStore
 
 logger = logging.getLogger(__name__)
 
+_STATUS_EMOJI = {
+    ProposalStatus.PENDING: "⏳",
+    ProposalStatus.ACCEPTED: "✅",
+    ProposalStatus.REJECTED: "❌",
+    ProposalStatus.EXPIRED: "⏰",
+}
+
+_ALREADY_HANDLED_TEXT = {
+    ProposalStatus.ACCEPTED: "✅ Already accepted",
+    ProposalStatus.REJECTED: "❌ Already rejected",
+    ProposalStatus.EXPIRED: "⏰ Expired",
+}
+
+# Keyboard shown after a proposal has been accepted or rejected
+_ACCEPTED_KB = {"inline_keyboard": [
+    [{"text": "🔄 Next", "callback_data": "NEXT"}],
+    [{"text": "📊 Status", "callback_data": "STATUS"}],
+]}
+
+_STATUS_TEMPLATE = (
+    "<b>📊 FarmCalc Status</b>\n"
+    "\n"
+    "<b>Watcher:</b>\n"
+    "Running: {running}\n"
+    "Enabled: {enabled}\n"
+    "Poll Interval: {poll_interval}s\n"
+    "Top N: {top_n}\n"
+    "Score Threshold: {spread_max_bps:.1f} bps spread\n"
+    "Last Tick: {last_tick}\n"
+    "Alerts (1h): {alerts_last_hour}\n"
+    "\n"
+    "<b>Plan Progress:</b>\n"
+    "Total Volume: ${total_volume:,.2f}\n"
+    "Remaining: ${remaining:,.2f}\n"
+    "Frozen Remaining: ${frozen_remaining:,.2f}\n"
+    "FOMO Minted Est: {fomo_minted:.2f}\n"
+    "\n"
+    "<b>Active Trades:</b> {active_trades}\n"
+    "<b>Pending Proposals:</b> {pending_proposals}\n"
+    "\n"
+    "<b>Total Fees:</b> ${total_fees:.2f}\n"
+    "<b>Funding PnL:</b> ${funding_pnl:.2f}"
+)
+
 
 def is_owner(user_id: int, chat_id: Optional[int], settings: Settings) -> bool:
     """Check if user is the owner and chat is allowed.
@@ -30,17 +76,85 @@ def is_owner(user_id: int, chat_id: Optional[int], settings: Settings) -> bool:
     Returns:
         True if user is owner and chat is allowed
     """
-    # Check owner ID
-    if not settings.telegram_owner_id or user_id != settings.telegram_owner_id:
+    owner_id = settings.telegram_owner_id
+    if not owner_id or user_id != owner_id:
         return False
     
     # Check chat ID restriction if set
-    if settings.telegram_allowed_chat_id:
-        chat_id_str = str(chat_id) if chat_id else None
-        if chat_id_str != settings.telegram_allowed_chat_id:
-            return False
+    allowed_chat_id = _allowed_chat_id(settings.telegram_allowed_chat_id)
+    return allowed_chat_id is None or (bool(chat_id) and chat_id == allowed_chat_id)
+
+
+@lru_cache(maxsize=8)
+def _allowed_chat_id(raw: Optional[str]) -> Optional[int]:
+    """Parse the allowed chat ID setting once per distinct value.
     
-    return True
+    Returns None when no restriction is set. A value that is not an integer
+    maps to 0, which never matches since updates without a chat are refused.
+    """
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning(f"Ignoring non-numeric TELEGRAM_ALLOWED_CHAT_ID {raw!r}; refusing all chats")
+        return 0
+
+
+class UpdateView(NamedTuple):
+    """Fields extracted from a Telegram update in a single pass."""
+    user_id: Optional[int]
+    chat_id: Optional[int]
+    username: Optional[str]
+    text: str
+    message_id: Optional[int]
+    callback_data: str
+    callback_id: Optional[str]
+    is_callback: bool
+
+
+_EMPTY_VIEW = UpdateView(None, None, None, "", None, "", None, False)
+
+
+def parse_update(update: Dict) -> UpdateView:
+    """Extract sender, chat and payload fields from a Telegram update.
+    
+    Args:
+        update: Telegram update dict
+    
+    Returns:
+        UpdateView; fields missing from the update are None/empty
+    """
+    message = update.get("message")
+    if message is not None:
+        from_user = message.get("from", {})
+        return UpdateView(
+            user_id=from_user.get("id"),
+            chat_id=message.get("chat", {}).get("id"),
+            username=from_user.get("username"),
+            text=message.get("text", ""),
+            message_id=message.get("message_id"),
+            callback_data="",
+            callback_id=None,
+            is_callback=False,
+        )
+    
+    callback_query = update.get("callback_query")
+    if callback_query is not None:
+        from_user = callback_query.get("from", {})
+        cb_message = callback_query.get("message", {})
+        return UpdateView(
+            user_id=from_user.get("id"),
+            chat_id=cb_message.get("chat", {}).get("id"),
+            username=from_user.get("username"),
+            text="",
+            message_id=cb_message.get("message_id"),
+            callback_data=callback_query.get("data", ""),
+            callback_id=callback_query.get("id"),
+            is_callback=True,
+        )
+    
+    return _EMPTY_VIEW
 
 
 def get_user_id_from_update(update: Dict) -> Optional[int]:
@@ -52,17 +166,7 @@ def get_user_id_from_update(update: Dict) -> Optional[int]:
     Returns:
         User ID or None
     """
-    # From message
-    if "message" in update:
-        from_user = update["message"].get("from", {})
-        return from_user.get("id")
-    
-    # From callback_query
-    if "callback_query" in update:
-        from_user = update["callback_query"].get("from", {})
-        return from_user.get("id")
-    
-    return None
+    return parse_update(update).user_id
 
 
 def get_chat_id_from_update(update: Dict) -> Optional[int]:
@@ -74,16 +178,7 @@ def get_chat_id_from_update(update: Dict) -> Optional[int]:
     Returns:
         Chat ID or None
     """
-    # From message
-    if "message" in update:
-        return update["message"].get("chat", {}).get("id")
-    
-    # From callback_query
-    if "callback_query" in update:
-        message = update["callback_query"].get("message", {})
-        return message.get("chat", {}).get("id")
-    
-    return None
+    return parse_update(update).chat_id
 
 
 def get_username_from_update(update: Dict) -> Optional[str]:
@@ -95,17 +190,243 @@ def get_username_from_update(update: Dict) -> Optional[str]:
     Returns:
         Username or None
     """
-    # From message
-    if "message" in update:
-        from_user = update["message"].get("from", {})
-        return from_user.get("username")
+    return parse_update(update).username
+
+
+@dataclass
+class CommandContext:
+    """Per-update context passed to command and callback handlers."""
+    user_id: Optional[int]
+    chat_id: Optional[int]
+    username: Optional[str]
+    state_store: StateStore
+    watch_state_store: WatchStateStore
+    telegram_client: TelegramClient
+    settings: Settings
+    watcher_service: Any = None
+    callback_id: Optional[str] = None
+    message_id: Optional[int] = None
+
+
+def _cmd_whoami(command_parts: List[str], ctx: CommandContext) -> bool:
+    """Handle /whoami: show user, chat and bot mode info."""
+    # Determine bot mode
+    webhook_info = ctx.telegram_client.get_webhook_info()
+    bot_mode = "webhook" if webhook_info and webhook_info.get("url") else "polling"
+    
+    _, watch_state = ctx.watch_state_store.load_cached()
+    
+    msg = (
+        f"<b>👤 User Info</b>\n\n"
+        f"<b>User ID:</b> <code>{ctx.user_id}</code>\n"
+        f"<b>Chat ID:</b> <code>{ctx.chat_id}</code>\n"
+        f"<b>Username:</b> @{ctx.username if ctx.username else 'N/A'}\n"
+        f"<b>Bot Mode:</b> {bot_mode}\n"
+        f"<b>Watcher Running:</b> {'🟢 Yes' if watch_state.is_running else '🔴 No'}\n"
+        f"<b>Watcher Enabled:</b> {'✅ Yes' if watch_state.enabled else '⏸ Paused'}\n"
+    )
+    ctx.telegram_client.send_message(msg, chat_id=ctx.chat_id)
+    return True
+
+
+def _cmd_status(command_parts: List[str], ctx: CommandContext) -> bool:
+    """Handle /status: show watcher state and plan progress."""
+    _, state = ctx.state_store.load_cached()
+    _, watch_state = ctx.watch_state_store.load_cached()
+    
+    stats = state.stats
+    config = watch_state.config
+    values = {
+        "running": "🟢 Yes" if watch_state.is_running else "🔴 No",
+        "enabled": "✅ Yes" if watch_state.enabled else "⏸ Paused",
+        "poll_interval": config.poll_interval_sec,
+        "top_n": config.top_n,
+        "spread_max_bps": config.thresholds.spread_max_bps,
+        "last_tick": watch_state.last_poll_time or "Never",
+        "alerts_last_hour": watch_state.alerts_last_hour(time.time()),
+        "total_volume": stats.total_volume_done,
+        "remaining": max(0, state.plan.target_volume - stats.total_volume_done),
+        "frozen_remaining": stats.frozen_remaining,
+        "fomo_minted": stats.estimated_fomo_minted,
+        "active_trades": sum(1 for t in state.trades if t.close_price is None),
+        "pending_proposals": sum(
+            1 for p in state.proposals.values()
+            if p.status is ProposalStatus.PENDING
+        ),
+        "total_fees": stats.total_fees,
+        "funding_pnl": stats.total_funding_pnl,
+    }
+    
+    ctx.telegram_client.send_message(_STATUS_TEMPLATE.format_map(values), chat_id=ctx.chat_id)
+    return True
+
+
+def _cmd_pause(command_parts: List[str], ctx: CommandContext) -> bool:
+    """Handle /pause: disable watcher alerts."""
+    ctx.watch_state_store.set_enabled(False)
+    ctx.telegram_client.send_message(
+        "⏸ Watcher paused. Use /resume to resume.",
+        chat_id=ctx.chat_id,
+    )
+    logger.info(f"Watcher paused by user {ctx.user_id}")
+    return True
+
+
+def _cmd_resume(command_parts: List[str], ctx: CommandContext) -> bool:
+    """Handle /resume: re-enable watcher alerts."""
+    ctx.watch_state_store.set_enabled(True)
+    ctx.telegram_client.send_message(
+        "▶️ Watcher resumed.",
+        chat_id=ctx.chat_id,
+    )
+    logger.info(f"Watcher resumed by user {ctx.user_id}")
+    return True
+
+
+def _cmd_mute(command_parts: List[str], ctx: CommandContext) -> bool:
+    """Handle /mute <COIN> [minutes]: silence proposals for a coin."""
+    if len(command_parts) < 2:
+        ctx.telegram_client.send_message(
+            "Usage: /mute <COIN> [minutes]\nExample: /mute BTC 60",
+            chat_id=ctx.chat_id,
+        )
+        return True
+    
+    coin = command_parts[1].upper()
+    minutes = int(command_parts[2]) if len(command_parts) > 2 and command_parts[2].isdigit() else 60
+    
+    unmute_time = time.time() + (minutes * 60)
+    
+    def update_mute(ws: WatchState):
+        ws.muted_coins[coin] = unmute_time
+    
+    ctx.watch_state_store.update_atomic(update_mute)
+    
+    ctx.telegram_client.send_message(
+        f"🔕 Muted {coin} for {minutes} minutes.",
+        chat_id=ctx.chat_id,
+    )
+    return True
+
+
+def _cmd_unmute(command_parts: List[str], ctx: CommandContext) -> bool:
+    """Handle /unmute <COIN>: lift a coin mute."""
+    if len(command_parts) < 2:
+        ctx.telegram_client.send_message(
+            "Usage: /unmute <COIN>\nExample: /unmute BTC",
+            chat_id=ctx.chat_id,
+        )
+        return True
+    
+    coin = command_parts[1].upper()
+    
+    def remove_mute(ws: WatchState):
+        ws.muted_coins.pop(coin, None)
+    
+    ctx.watch_state_store.update_atomic(remove_mute)
+    
+    ctx.telegram_client.send_message(
+        f"🔔 Unmuted {coin}.",
+        chat_id=ctx.chat_id,
+    )
+    return True
+
+
+def _cmd_mutes(command_parts: List[str], ctx: CommandContext) -> bool:
+    """Handle /mutes: list active coin mutes."""
+    _, watch_state = ctx.watch_state_store.load_cached()
+    now = time.time()
+    
+    active_mutes = []
+    for coin, unmute_time in watch_state.muted_coins.items():
+        if unmute_time > now:
+            minutes_left = int((unmute_time - now) / 60)
+            active_mutes.append(f"{coin}: {minutes_left}m")
+    
+    if active_mutes:
+        msg = "<b>🔕 Active Mutes:</b>\n" + "\n".join(active_mutes)
+    else:
+        msg = "No active mutes."
+    
+    ctx.telegram_client.send_message(msg, chat_id=ctx.chat_id)
+    return True
+
+
+def _cmd_history(command_parts: List[str], ctx: CommandContext) -> bool:
+    """Handle /history [n]: list the most recent proposals."""
+    n = int(command_parts[1]) if len(command_parts) > 1 and command_parts[1].isdigit() else 10
+    _, state = ctx.state_store.load_cached()
     
-    # From callback_query
-    if "callback_query" in update:
-        from_user = update["callback_query"].get("from", {})
-        return from_user.get("username")
+    proposals = heapq.nlargest(n, state.proposals.values(), key=lambda p: p.created_at)
     
-    return None
+    if not proposals:
+        ctx.telegram_client.send_message("No proposals found.", chat_id=ctx.chat_id)
+        return True
+    
+    msg_parts = [f"<b>📜 Last {len(proposals)} Proposals:</b>", ""]
+    for prop in proposals:
+        status_emoji = _STATUS_EMOJI.get(prop.status, "❓")
+        msg_parts.append(
+            f"{status_emoji} {prop.coin} {prop.side} | Score: {prop.score:.0f} | {prop.created_at[:19]}"
+        )
+    
+    ctx.telegram_client.send_message("\n".join(msg_parts), chat_id=ctx.chat_id)
+    return True
+
+
+def _cmd_next(command_parts: List[str], ctx: CommandContext) -> bool:
+    """Handle /next: force an evaluation and show the best candidate."""
+    if not ctx.watcher_service:
+        ctx.telegram_client.send_message(
+            "❌ Watcher service not available.",
+            chat_id=ctx.chat_id,
+        )
+        return True
+    
+    # Force evaluation
+    try:
+        snapshot = ctx.watcher_service.evaluate_now()
+        if snapshot:
+            # Get best candidate
+            best = max(
+                snapshot.items(),
+                key=lambda x: x[1].get("score", 0),
+            )
+            coin, data = best
+            
+            ctx.telegram_client.send_message(
+                f"<b>🔄 Best Current Candidate:</b>\n\n"
+                f"<b>{coin}</b>\n"
+                f"Score: {data.get('score', 0):.0f}/100\n"
+                f"Reasons: {', '.join(data.get('reasons', [])[:3])}",
+                chat_id=ctx.chat_id,
+            )
+        else:
+            ctx.telegram_client.send_message(
+                "No safe entry candidates found at this time.",
+                chat_id=ctx.chat_id,
+            )
+    except Exception as e:
+        logger.error(f"Error in /next: {e}", exc_info=True)
+        ctx.telegram_client.send_message(
+            f"❌ Error: {str(e)}",
+            chat_id=ctx.chat_id,
+        )
+    return True
+
+
+# Command name -> handler, built once at import
+_COMMAND_HANDLERS: Dict[str, Callable[[List[str], CommandContext], bool]] = {
+    "/whoami": _cmd_whoami,
+    "/status": _cmd_status,
+    "/pause": _cmd_pause,
+    "/resume": _cmd_resume,
+    "/mute": _cmd_mute,
+    "/unmute": _cmd_unmute,
+    "/mutes": _cmd_mutes,
+    "/history": _cmd_history,
+    "/next": _cmd_next,
+}
 
 
 def handle_message(
@@ -115,6 +436,7 @@ def handle_message(
     telegram_client: TelegramClient,
     settings: Settings,
     watcher_service=None,
+    view: Optional[UpdateView] = None,
 ) -> bool:
     """Handle incoming message (commands).
     
@@ -125,15 +447,16 @@ def handle_message(
         telegram_client: Telegram client
         settings: Settings instance
         watcher_service: Optional WatcherService instance
+        view: Pre-parsed update; parsed from update if omitted
     
     Returns:
         True if handled
     """
-    message = update.get("message", {})
-    text = message.get("text", "")
-    chat_id = message.get("chat", {}).get("id")
-    user_id = get_user_id_from_update(update)
-    username = get_username_from_update(update)
+    if view is None:
+        view = parse_update(update)
+    text = view.text
+    chat_id = view.chat_id
+    user_id = view.user_id
     
     if not text.startswith("/"):
         return False
@@ -147,223 +470,177 @@ def handle_message(
         return True
     
     command_parts = text.split()
-    command = command_parts[0].lower()
+    handler = _COMMAND_HANDLERS.get(command_parts[0].lower())
+    if handler is None:
+        return False
     
-    if command == "/whoami":
-        # Determine bot mode
-        webhook_info = telegram_client.get_webhook_info()
-        bot_mode = "webhook" if webhook_info and webhook_info.get("url") else "polling"
-        
-        watch_state = watch_state_store.load()
-        
-        msg = (
-            f"<b>👤 User Info</b>\n\n"
-            f"<b>User ID:</b> <code>{user_id}</code>\n"
-            f"<b>Chat ID:</b> <code>{chat_id}</code>\n"
-            f"<b>Username:</b> @{username if username else 'N/A'}\n"
-            f"<b>Bot Mode:</b> {bot_mode}\n"
-            f"<b>Watcher Running:</b> {'🟢 Yes' if watch_state.is_running else '🔴 No'}\n"
-            f"<b>Watcher Enabled:</b> {'✅ Yes' if watch_state.enabled else '⏸ Paused'}\n"
+    ctx = CommandContext(
+        user_id=user_id,
+        chat_id=chat_id,
+        username=view.username,
+        state_store=state_store,
+        watch_state_store=watch_state_store,
+        telegram_client=telegram_client,
+        settings=settings,
+        watcher_service=watcher_service,
+    )
+    return handler(command_parts, ctx)
+
+
+_last_hms: Tuple[int, str] = (0, "")
+
+
+def _utc_hms_now() -> str:
+    """Return the current UTC time as HH:MM:SS, formatted once per second."""
+    global _last_hms
+    now_ts = int(time.time())
+    cached_ts, cached_hms = _last_hms
+    if now_ts != cached_ts:
+        tm = time.gmtime(now_ts)
+        cached_hms = f"{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+        _last_hms = (now_ts, cached_hms)
+    return cached_hms
+
+
+def _answer_already_decided(proposal, ctx: CommandContext):
+    """Tell the user a proposal was already accepted, rejected or expired."""
+    if proposal and proposal.status is not ProposalStatus.PENDING:
+        status_text = _ALREADY_HANDLED_TEXT.get(proposal.status, "Already handled")
+        
+        ctx.telegram_client.answer_callback_query(
+            ctx.callback_id,
+            text=status_text,
+            show_alert=True,
         )
-        telegram_client.send_message(msg, chat_id=chat_id)
-        return True
-    
-    if command == "/status":
-        state = state_store.load()
-        watch_state = watch_state_store.load()
-        
-        active_trades = [t for t in state.trades if t.close_price is None]
-        pending_proposals = [
-            p for p in state.proposals.values()
-            if p.status == ProposalStatus.PENDING.value
-        ]
-        
-        # Count alerts in last hour
-        now = time.time()
-        alerts_last_hour = sum(
-            1 for alert in watch_state.last_alerts
-            if now - alert.get("timestamp_ts", 0) < 3600
+
+
+def _cb_accept(proposal_id: str, ctx: CommandContext) -> bool:
+    """Handle ACCEPT:<proposal_id>: record a trade and update the message."""
+    settings = ctx.settings
+    user_id = ctx.user_id
+    
+    # Use atomic update
+    trade, proposal = ctx.state_store.update_atomic(
+        lambda s: (accept_proposal(s, proposal_id, user_id, settings), s.proposals.get(proposal_id))
+    )
+    
+    if trade and proposal:
+        # Update message
+        text, _ = format_proposal_message(proposal, settings)
+        text = f"✅ <b>ACCEPTED</b> at {_utc_hms_now()} UTC\n\n{text}"
+        
+        ctx.telegram_client.edit_message_text(
+            text,
+            chat_id=ctx.chat_id,
+            message_id=ctx.message_id,
+            reply_markup=_ACCEPTED_KB,
         )
-        
-        msg_parts = [
-            "<b>📊 FarmCalc Status</b>",
-            "",
-            "<b>Watcher:</b>",
-            f"Running: {'🟢 Yes' if watch_state.is_running else '🔴 No'}",
-            f"Enabled: {'✅ Yes' if watch_state.enabled else '⏸ Paused'}",
-            f"Poll Interval: {watch_state.config.poll_interval_sec}s",
-            f"Top N: {watch_state.config.top_n}",
-            f"Score Threshold: {watch_state.config.thresholds.spread_max_bps:.1f} bps spread",
-            f"Last Tick: {watch_state.last_poll_time or 'Never'}",
-            f"Alerts (1h): {alerts_last_hour}",
-            "",
-            "<b>Plan Progress:</b>",
-            f"Total Volume: ${state.stats.total_volume_done:,.2f}",
-            f"Remaining: ${max(0, state.plan.target_volume - state.stats.total_volume_done):,.2f}",
-            f"Frozen Remaining: ${state.stats.frozen_remaining:,.2f}",
-            f"FOMO Minted Est: {state.stats.estimated_fomo_minted:.2f}",
-            "",
-            f"<b>Active Trades:</b> {len(active_trades)}",
-            f"<b>Pending Proposals:</b> {len(pending_proposals)}",
-            "",
-            f"<b>Total Fees:</b> ${state.stats.total_fees:.2f}",
-            f"<b>Funding PnL:</b> ${state.stats.total_funding_pnl:.2f}",
-        ]
-        
-        telegram_client.send_message("\n".join(msg_parts), chat_id=chat_id)
-        return True
+        logger.info(f"Proposal {proposal_id} accepted via Telegram")
+    else:
+        # Already handled or expired
+        _answer_already_decided(proposal, ctx)
     
-    if command == "/pause":
-        watch_state_store.update_atomic(lambda ws: setattr(ws, "enabled", False))
-        telegram_client.send_message(
-            "⏸ Watcher paused. Use /resume to resume.",
-            chat_id=chat_id,
-        )
-        logger.info(f"Watcher paused by user {user_id}")
-        return True
-    
-    if command == "/resume":
-        watch_state_store.update_atomic(lambda ws: setattr(ws, "enabled", True))
-        telegram_client.send_message(
-            "▶️ Watcher resumed.",
-            chat_id=chat_id,
+    return True
+
+
+def _cb_reject(proposal_id: str, ctx: CommandContext) -> bool:
+    """Handle REJECT:<proposal_id>: mark the proposal rejected."""
+    user_id = ctx.user_id
+    
+    # Use atomic update
+    success, proposal = ctx.state_store.update_atomic(
+        lambda s: (reject_proposal(s, proposal_id, user_id), s.proposals.get(proposal_id))
+    )
+    
+    if success and proposal:
+        # Update message
+        text, _ = format_proposal_message(proposal, ctx.settings)
+        text = f"❌ <b>REJECTED</b> at {_utc_hms_now()} UTC\n\n{text}"
+        
+        ctx.telegram_client.edit_message_text(
+            text,
+            chat_id=ctx.chat_id,
+            message_id=ctx.message_id,
+            reply_markup=_ACCEPTED_KB,
         )
-        logger.info(f"Watcher resumed by user {user_id}")
-        return True
+        logger.info(f"Proposal {proposal_id} rejected via Telegram")
+    else:
+        _answer_already_decided(proposal, ctx)
     
-    if command == "/mute":
-        if len(command_parts) < 2:
-            telegram_client.send_message(
-                "Usage: /mute <COIN> [minutes]\nExample: /mute BTC 60",
-                chat_id=chat_id,
-            )
-            return True
-        
-        coin = command_parts[1].upper()
-        minutes = int(command_parts[2]) if len(command_parts) > 2 and command_parts[2].isdigit() else 60
-        
+    return True
+
+
+def _cb_pause(arg: str, ctx: CommandContext) -> bool:
+    """Handle PAUSE button."""
+    ctx.watch_state_store.set_enabled(False)
+    ctx.telegram_client.answer_callback_query(
+        ctx.callback_id,
+        text="⏸ Watcher paused",
+    )
+    logger.info(f"Watcher paused via Telegram by user {ctx.user_id}")
+    return True
+
+
+def _cb_resume(arg: str, ctx: CommandContext) -> bool:
+    """Handle RESUME button."""
+    ctx.watch_state_store.set_enabled(True)
+    ctx.telegram_client.answer_callback_query(
+        ctx.callback_id,
+        text="▶️ Watcher resumed",
+    )
+    logger.info(f"Watcher resumed via Telegram by user {ctx.user_id}")
+    return True
+
+
+def _cb_mute(arg: str, ctx: CommandContext) -> bool:
+    """Handle MUTE:<coin>:<minutes> button."""
+    coin, sep, minutes_str = arg.partition(":")
+    if sep:
+        minutes_str = minutes_str.partition(":")[0]
+        minutes = int(minutes_str) if minutes_str.isdigit() else 60
         unmute_time = time.time() + (minutes * 60)
         
-        def update_mute(ws: WatchState):
-            ws.muted_coins[coin] = unmute_time
-        
-        watch_state_store.update_atomic(update_mute)
-        
-        telegram_client.send_message(
-            f"🔕 Muted {coin} for {minutes} minutes.",
-            chat_id=chat_id,
+        ctx.watch_state_store.update_atomic(
+            lambda ws: ws.muted_coins.update({coin: unmute_time})
         )
-        return True
-    
-    if command == "/unmute":
-        if len(command_parts) < 2:
-            telegram_client.send_message(
-                "Usage: /unmute <COIN>\nExample: /unmute BTC",
-                chat_id=chat_id,
-            )
-            return True
-        
-        coin = command_parts[1].upper()
-        
-        def remove_mute(ws: WatchState):
-            ws.muted_coins.pop(coin, None)
         
-        watch_state_store.update_atomic(remove_mute)
-        
-        telegram_client.send_message(
-            f"🔔 Unmuted {coin}.",
-            chat_id=chat_id,
+        ctx.telegram_client.answer_callback_query(
+            ctx.callback_id,
+            text=f"🔕 Muted {coin} for {minutes}m",
         )
-        return True
-    
-    if command == "/mutes":
-        watch_state = watch_state_store.load()
-        now = time.time()
-        
-        active_mutes = []
-        for coin, unmute_time in watch_state.muted_coins.items():
-            if unmute_time > now:
-                minutes_left = int((unmute_time - now) / 60)
-                active_mutes.append(f"{coin}: {minutes_left}m")
-        
-        if active_mutes:
-            msg = "<b>🔕 Active Mutes:</b>\n" + "\n".join(active_mutes)
-        else:
-            msg = "No active mutes."
-        
-        telegram_client.send_message(msg, chat_id=chat_id)
-        return True
-    
-    if command == "/history":
-        n = int(command_parts[1]) if len(command_parts) > 1 and command_parts[1].isdigit() else 10
-        state = state_store.load()
-        
-        proposals = sorted(
-            state.proposals.values(),
-            key=lambda p: p.created_at,
-            reverse=True,
-        )[:n]
-        
-        if not proposals:
-            telegram_client.send_message("No proposals found.", chat_id=chat_id)
-            return True
-        
-        msg_parts = [f"<b>📜 Last {len(proposals)} Proposals:</b>", ""]
-        for prop in proposals:
-            status_emoji = {
-                ProposalStatus.PENDING.value: "⏳",
-                ProposalStatus.ACCEPTED.value: "✅",
-                ProposalStatus.REJECTED.value: "❌",
-                ProposalStatus.EXPIRED.value: "⏰",
-            }.get(prop.status, "❓")
-            
-            msg_parts.append(
-                f"{status_emoji} {prop.coin} {prop.side} | Score: {prop.score:.0f} | {prop.created_at[:19]}"
-            )
-        
-        telegram_client.send_message("\n".join(msg_parts), chat_id=chat_id)
-        return True
-    
-    if command == "/next":
-        if not watcher_service:
-            telegram_client.send_message(
-                "❌ Watcher service not available.",
-                chat_id=chat_id,
-            )
-            return True
-        
-        # Force evaluation
-        try:
-            snapshot = watcher_service.evaluate_now()
-            if snapshot:
-                # Get best candidate
-                best = max(
-                    snapshot.items(),
-                    key=lambda x: x[1].get("score", 0),
-                )
-                coin, data = best
-                
-                telegram_client.send_message(
-                    f"<b>🔄 Best Current Candidate:</b>\n\n"
-                    f"<b>{coin}</b>\n"
-                    f"Score: {data.get('score', 0):.0f}/100\n"
-                    f"Reasons: {', '.join(data.get('reasons', [])[:3])}",
-                    chat_id=chat_id,
-                )
-            else:
-                telegram_client.send_message(
-                    "No safe entry candidates found at this time.",
-                    chat_id=chat_id,
-                )
-        except Exception as e:
-            logger.error(f"Error in /next: {e}", exc_info=True)
-            telegram_client.send_message(
-                f"❌ Error: {str(e)}",
-                chat_id=chat_id,
-            )
-        return True
-    
-    return False
+    return True
+
+
+def _cb_next(arg: str, ctx: CommandContext) -> bool:
+    """Handle NEXT button."""
+    ctx.telegram_client.answer_callback_query(
+        ctx.callback_id,
+        text="Use /next command for best candidate",
+    )
+    return True
+
+
+def _cb_status(arg: str, ctx: CommandContext) -> bool:
+    """Handle STATUS button."""
+    ctx.telegram_client.answer_callback_query(
+        ctx.callback_id,
+        text="Use /status command for detailed status",
+    )
+    return True
+
+
+_CB_HANDLERS: Dict[str, Callable[[str, CommandContext], bool]] = {
+    "ACCEPT": _cb_accept,
+    "REJECT": _cb_reject,
+    "PAUSE": _cb_pause,
+    "RESUME": _cb_resume,
+    "MUTE": _cb_mute,
+    "NEXT": _cb_next,
+    "STATUS": _cb_status,
+}
+
+# Callbacks that carry "<PREFIX>:<arg>"; every other action must match exactly
+_CB_TAKES_ARG = frozenset({"ACCEPT", "REJECT", "MUTE"})
 
 
 def handle_callback_query(
@@ -372,6 +649,7 @@ def handle_callback_query(
     watch_state_store: WatchStateStore,
     telegram_client: TelegramClient,
     settings: Settings,
+    view: Optional[UpdateView] = None,
 ) -> bool:
     """Handle callback query (button presses).
     
@@ -381,17 +659,16 @@ def handle_callback_query(
         watch_state_store: Watch state store
         telegram_client: Telegram client
         settings: Settings instance
+        view: Pre-parsed update; parsed from update if omitted
     
     Returns:
         True if handled
     """
-    callback_query = update.get("callback_query", {})
-    callback_data = callback_query.get("data", "")
-    callback_id = callback_query.get("id")
-    user_id = get_user_id_from_update(update)
-    chat_id = get_chat_id_from_update(update)
-    message = callback_query.get("message", {})
-    message_id = message.get("message_id")
+    if view is None:
+        view = parse_update(update)
+    callback_id = view.callback_id
+    user_id = view.user_id
+    chat_id = view.chat_id
     
     # Check owner
     if not is_owner(user_id, chat_id, settings):
@@ -405,154 +682,23 @@ def handle_callback_query(
     # Always answer callback query
     telegram_client.answer_callback_query(callback_id)
     
-    # Parse callback data
-    if callback_data.startswith("ACCEPT:"):
-        proposal_id = callback_data.split(":", 1)[1]
-        
-        trade_result = [None]
-        proposal_result = [None]
-        
-        def accept_and_update(state: State):
-            trade = accept_proposal(state, proposal_id, user_id, settings)
-            trade_result[0] = trade
-            proposal_result[0] = state.proposals.get(proposal_id)
-        
-        # Use atomic update
-        state_store.update_atomic(accept_and_update)
-        trade = trade_result[0]
-        proposal = proposal_result[0]
-        
-        if trade and proposal:
-            # Update message
-            text, _ = format_proposal_message(proposal, settings)
-            now = datetime.now(timezone.utc)
-            text = f"✅ <b>ACCEPTED</b> at {now.strftime('%H:%M:%S')} UTC\n\n{text}"
-            
-            telegram_client.edit_message_text(
-                text,
-                chat_id=chat_id,
-                message_id=message_id,
-                reply_markup={"inline_keyboard": [
-                    [{"text": "🔄 Next", "callback_data": "NEXT"}],
-                    [{"text": "📊 Status", "callback_data": "STATUS"}],
-                ]},
-            )
-            logger.info(f"Proposal {proposal_id} accepted via Telegram")
-        else:
-            # Already handled or expired
-            if proposal and proposal.status != ProposalStatus.PENDING.value:
-                status_text = {
-                    ProposalStatus.ACCEPTED.value: "✅ Already accepted",
-                    ProposalStatus.REJECTED.value: "❌ Already rejected",
-                    ProposalStatus.EXPIRED.value: "⏰ Expired",
-                }.get(proposal.status, "Already handled")
-                
-                telegram_client.answer_callback_query(
-                    callback_id,
-                    text=status_text,
-                    show_alert=True,
-                )
-        
-        return True
-    
-    if callback_data.startswith("REJECT:"):
-        proposal_id = callback_data.split(":", 1)[1]
-        
-        success_result = [False]
-        proposal_result = [None]
-        
-        def reject_and_update(state: State):
-            success = reject_proposal(state, proposal_id, user_id)
-            success_result[0] = success
-            proposal_result[0] = state.proposals.get(proposal_id)
-        
-        # Use atomic update
-        state_store.update_atomic(reject_and_update)
-        success = success_result[0]
-        proposal = proposal_result[0]
-        
-        if success and proposal:
-            # Update message
-            text, _ = format_proposal_message(proposal, settings)
-            now = datetime.now(timezone.utc)
-            text = f"❌ <b>REJECTED</b> at {now.strftime('%H:%M:%S')} UTC\n\n{text}"
-            
-            telegram_client.edit_message_text(
-                text,
-                chat_id=chat_id,
-                message_id=message_id,
-                reply_markup={"inline_keyboard": [
-                    [{"text": "🔄 Next", "callback_data": "NEXT"}],
-                    [{"text": "📊 Status", "callback_data": "STATUS"}],
-                ]},
-            )
-            logger.info(f"Proposal {proposal_id} rejected via Telegram")
-        else:
-            if proposal and proposal.status != ProposalStatus.PENDING.value:
-                status_text = {
-                    ProposalStatus.ACCEPTED.value: "✅ Already accepted",
-                    ProposalStatus.REJECTED.value: "❌ Already rejected",
-                    ProposalStatus.EXPIRED.value: "⏰ Expired",
-                }.get(proposal.status, "Already handled")
-                
-                telegram_client.answer_callback_query(
-                    callback_id,
-                    text=status_text,
-                    show_alert=True,
-                )
-        
-        return True
-    
-    if callback_data == "PAUSE":
-        watch_state_store.update_atomic(lambda ws: setattr(ws, "enabled", False))
-        telegram_client.answer_callback_query(
-            callback_id,
-            text="⏸ Watcher paused",
-        )
-        logger.info(f"Watcher paused via Telegram by user {user_id}")
-        return True
-    
-    if callback_data == "RESUME":
-        watch_state_store.update_atomic(lambda ws: setattr(ws, "enabled", True))
-        telegram_client.answer_callback_query(
-            callback_id,
-            text="▶️ Watcher resumed",
-        )
-        logger.info(f"Watcher resumed via Telegram by user {user_id}")
-        return True
-    
-    if callback_data.startswith("MUTE:"):
-        parts = callback_data.split(":")
-        if len(parts) >= 3:
-            coin = parts[1]
-            minutes = int(parts[2]) if parts[2].isdigit() else 60
-            unmute_time = time.time() + (minutes * 60)
-            
-            watch_state_store.update_atomic(
-                lambda ws: ws.muted_coins.update({coin: unmute_time})
-            )
-            
-            telegram_client.answer_callback_query(
-                callback_id,
-                text=f"🔕 Muted {coin} for {minutes}m",
-            )
-        return True
-    
-    if callback_data == "NEXT":
-        telegram_client.answer_callback_query(
-            callback_id,
-            text="Use /next command for best candidate",
-        )
-        return True
-    
-    if callback_data == "STATUS":
-        telegram_client.answer_callback_query(
-            callback_id,
-            text="Use /status command for detailed status",
-        )
-        return True
+    prefix, sep, arg = view.callback_data.partition(":")
+    handler = _CB_HANDLERS.get(prefix)
+    if handler is None or bool(sep) != (prefix in _CB_TAKES_ARG):
+        return False
     
-    return False
+    ctx = CommandContext(
+        user_id=user_id,
+        chat_id=chat_id,
+        username=view.username,
+        state_store=state_store,
+        watch_state_store=watch_state_store,
+        telegram_client=telegram_client,
+        settings=settings,
+        callback_id=callback_id,
+        message_id=view.message_id,
+    )
+    return handler(arg, ctx)
 
 
 def process_update(
@@ -576,19 +722,22 @@ def process_update(
     Returns:
         True if update was handled
     """
-    # Expire old proposals first
-    state_store.update_atomic(lambda s: expire_proposals(s))
+    # Expire old proposals first (only once something can have expired)
+    if time.time() >= state_store.peek_next_expiry():
+        state_store.update_atomic(lambda s: expire_proposals(s))
+    
+    view = parse_update(update)
     
     # Handle callback queries
-    if "callback_query" in update:
+    if view.is_callback:
         return handle_callback_query(
-            update, state_store, watch_state_store, telegram_client, settings
+            update, state_store, watch_state_store, telegram_client, settings, view
         )
     
     # Handle messages (commands)
     if "message" in update:
         return handle_message(
-            update, state_store, watch_state_store, telegram_client, settings, watcher_service
+            update, state_store, watch_state_store, telegram_client, settings, watcher_service, view
         )
     
     return False
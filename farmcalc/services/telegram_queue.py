@@ -3,10 +3,13 @@
 import asyncio
 import logging
 from collections import deque
-from typing import Deque, Dict
+from typing import Deque, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of ready updates drained per worker wakeup
+_BATCH_SIZE = 16
+
 
 class TelegramUpdateQueue:
     """Queue for processing Telegram updates asynchronously."""
@@ -17,15 +20,19 @@ class TelegramUpdateQueue:
         Args:
             maxsize: Maximum queue size
         """
-        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
-        self.metrics = {
-            "updates_received": 0,
-            "updates_processed": 0,
-            "processing_errors": 0,
-            "queue_drops": 0,
-        }
+        self.maxsize = maxsize
+        self._buf: Deque[Dict] = deque()
+        self._event = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._updates_received = 0
+        self._updates_processed = 0
+        self._processing_errors = 0
+        self._queue_drops = 0
         self._worker_task: asyncio.Task = None
         self._processor = None
+        self._is_async = False
     
     def enqueue(self, update: Dict) -> bool:
         """Enqueue an update for processing.
@@ -36,37 +43,94 @@ class TelegramUpdateQueue:
         Returns:
             True if enqueued, False if queue full
         """
-        try:
-            self.queue.put_nowait(update)
-            self.metrics["updates_received"] += 1
-            return True
-        except asyncio.QueueFull:
-            self.metrics["queue_drops"] += 1
+        if len(self._buf) >= self.maxsize:
+            self._queue_drops += 1
             logger.warning("Telegram update queue full, dropping update")
             return False
+        
+        self._buf.append(update)
+        self._updates_received += 1
+        self._wake()
+        return True
+    
+    def _wake(self):
+        """Signal the worker, hopping onto its loop when called from another thread."""
+        loop = self._loop
+        if loop is None:
+            return  # Worker not started yet; it drains the buffer on start
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._idle.clear()
+            self._event.set()
+        else:
+            loop.call_soon_threadsafe(self._idle.clear)
+            loop.call_soon_threadsafe(self._event.set)
     
     def set_processor(self, processor):
         """Set the processor function for updates.
         
+        Coroutine functions are awaited directly on the event loop; plain
+        functions are run in a worker thread.
+        
         Args:
             processor: Function that takes (update, ...) and processes it
         """
         self._processor = processor
+        self._is_async = asyncio.iscoroutinefunction(processor)
+    
+    def _process_batch(self, batch: List[Dict], *args, **kwargs) -> int:
+        """Run the processor over a batch of updates, isolating failures.
+        
+        Args:
+            batch: Updates to process, in arrival order
+            *args, **kwargs: Arguments to pass to processor
+        
+        Returns:
+            Number of updates that raised
+        """
+        errors = 0
+        for update in batch:
+            try:
+                self._processor(update, *args, **kwargs)
+            except Exception as e:
+                errors += 1
+                logger.error(f"Error processing Telegram update: {e}", exc_info=True)
+        return errors
+    
+    async def _process_batch_async(self, batch: List[Dict], *args, **kwargs) -> int:
+        """Async counterpart of _process_batch for coroutine processors."""
+        errors = 0
+        for update in batch:
+            try:
+                await self._processor(update, *args, **kwargs)
+            except Exception as e:
+                errors += 1
+                logger.error(f"Error processing Telegram update: {e}", exc_info=True)
+        return errors
     
     async def _worker(self, *args, **kwargs):
-        """Background worker that processes updates."""
+        """Background worker that processes updates in small batches."""
         logger.info("Telegram update queue worker started")
         while True:
             try:
-                update = await self.queue.get()
+                if not self._buf:
+                    self._idle.set()
+                    await self._event.wait()
+                    self._event.clear()
+                    continue
+                
+                batch = [self._buf.popleft() for _ in range(min(_BATCH_SIZE, len(self._buf)))]
+                
                 if self._processor:
-                    try:
-                        await asyncio.to_thread(self._processor, update, *args, **kwargs)
-                        self.metrics["updates_processed"] += 1
-                    except Exception as e:
-                        self.metrics["processing_errors"] += 1
-                        logger.error(f"Error processing Telegram update: {e}", exc_info=True)
-                self.queue.task_done()
+                    if self._is_async:
+                        errors = await self._process_batch_async(batch, *args, **kwargs)
+                    else:
+                        errors = await asyncio.to_thread(self._process_batch, batch, *args, **kwargs)
+                    self._updates_processed += len(batch) - errors
+                    self._processing_errors += errors
             except asyncio.CancelledError:
                 logger.info("Telegram update queue worker cancelled")
                 break
@@ -81,6 +145,9 @@ class TelegramUpdateQueue:
             *args, **kwargs: Arguments to pass to processor
         """
         if self._worker_task is None or self._worker_task.done():
+            self._loop = asyncio.get_running_loop()
+            if self._buf:
+                self._idle.clear()
             self._worker_task = asyncio.create_task(self._worker(*args, **kwargs))
             logger.info("Telegram update queue worker started")
     
@@ -90,6 +157,12 @@ class TelegramUpdateQueue:
             self._worker_task.cancel()
             logger.info("Telegram update queue worker stopped")
     
+    async def join(self):
+        """Wait until every enqueued update has been processed."""
+        if self._buf:
+            self._idle.clear()
+        await self._idle.wait()
+    
     def get_metrics(self) -> Dict:
         """Get queue metrics.
         
@@ -97,7 +170,10 @@ class TelegramUpdateQueue:
             Dict with metrics
         """
         return {
-            **self.metrics,
-            "queue_depth": self.queue.qsize(),
+            "updates_received": self._updates_received,
+            "updates_processed": self._updates_processed,
+            "processing_errors": self._processing_errors,
+            "queue_drops": self._queue_drops,
+            "queue_depth": len(self._buf),
         }
 
@@ -1,9 +1,11 @@
 """Watcher service for polling and alerting with debouncing and rate limiting."""
 
+import bisect
+import heapq
 import logging
+import queue
 import threading
 import time
-from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
@@ -20,14 +22,61 @@ from ..storage.state_store import StateStore, WatchStateStore
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between routine watch state writes from the poll loop
+_STATE_FLUSH_INTERVAL_SEC = 10.0
 
-@dataclass
-class AlertState:
-    """State for debouncing and hysteresis."""
-    consecutive_passes: int = 0
-    consecutive_fails: int = 0
-    armed: bool = False
-    last_alert_time: float = 0.0
+# Proposals waiting for the sender thread; further alerts are dropped when full
+_SEND_QUEUE_MAXSIZE = 64
+
+
+def _to_float(d: dict, key: str, default: float = 0.0) -> float:
+    """Read d[key] as a float, accepting numbers and numeric strings."""
+    val = d.get(key)
+    if val is None:
+        return default
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return default
+
+
+def _extract_funding(funding_field) -> float:
+    """Read a funding value that may be a number, a string or {"funding": ...}."""
+    if isinstance(funding_field, dict):
+        funding_field = funding_field.get("funding", 0)
+    try:
+        return float(funding_field)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _coin_entry(u: dict, ctx: dict) -> Dict:
+    """Build the parsed per-coin record from a universe item and its context."""
+    vlm = _to_float(ctx, "dayNtlVlm", 0)
+    return {
+        "coin": u["name"],
+        "dayNtlVlm": vlm,
+        "data": {
+            "maxLeverage": _to_float(u, "maxLeverage", 0),
+            "onlyIsolated": u.get("onlyIsolated", False),
+            "marginMode": u.get("marginMode"),
+            "funding": _extract_funding(ctx.get("funding")),
+            "markPx": _to_float(ctx, "markPx", 0),
+            "midPx": _to_float(ctx, "midPx", 0),
+            "oraclePx": _to_float(ctx, "oraclePx", 0),
+            "openInterest": _to_float(ctx, "openInterest", 0),
+            "dayNtlVlm": vlm,
+        }
+    }
+
+
+def _parse_coins(universe: List[Dict], contexts: List[Dict]) -> List[Dict]:
+    """Parse every named universe item that has a dict context."""
+    return [
+        _coin_entry(u, ctx)
+        for u, ctx in zip(universe, contexts)
+        if u.get("name") and isinstance(ctx, dict)
+    ]
 
 
 @dataclass
@@ -59,21 +108,55 @@ class WatcherService:
         self.settings = settings
         self.fill_model = fill_model or FillModelService()
         self._state: Optional[WatchState] = None
+        self._state_lock = threading.RLock()  # Guards state shared with the sender thread
+        self._last_state_flush: float = 0.0
         self._poll_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        
+        # Fill-model snapshots are handed off to a consumer thread as
+        # (coin, mid, bid, ask, spread_bps, depth_top) tuples; None stops it
+        self._fill_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._fill_thread: Optional[threading.Thread] = None
+        
+        # Proposal creation and Telegram sends run on a sender thread so the
+        # poll loop never waits on the Telegram API; None stops it
+        self._send_queue: queue.Queue = queue.Queue(maxsize=_SEND_QUEUE_MAXSIZE)
+        self._sender_thread: Optional[threading.Thread] = None
+        self._pending_alert_keys: set = set()  # Alerts queued but not yet sent
+        self._last_proposal_queued: float = 0.0
         self._last_snapshot: Dict[str, Dict] = {}
         
+        # Scoring and debouncing parameters
+        self._score_threshold: float = 80.0
+        self._debounce_count: int = 3
+        self._hysteresis: float = 5.0
+        self._fill_notional: float = 1000.0  # Assumed order notional for fill estimates
+        
+        # Last score per coin with the inputs it was computed from
+        self._score_cache: Dict[str, tuple] = {}
+        
         # Debouncing/hysteresis state per coin+side
         self._alert_states: Dict[str, AlertState] = {}
         
         # Global rate limiting
-        self._alert_times: deque = deque(maxlen=100)  # Track last 100 alerts
+        self._alert_times: List[float] = []  # Sorted alert timestamps
+        self._alert_low: int = 0  # Index of the oldest alert inside the 1h window
         self._max_alerts_per_hour: int = 10
         
+        # Coins muted as of the current tick
+        self._muted_set: frozenset = frozenset()
+        
         # Round-robin for L2 polling
         self._l2_poll_index: int = 0
         
         # Meta refresh slower (60s default)
         self._meta_refresh_interval: float = 60.0
+        
+        # Parsed universe from the last meta refresh and its top-N by volume
+        self._parsed_universe: List[Dict] = []
+        self._universe_vlm: List[float] = []  # dayNtlVlm aligned with _parsed_universe
+        self._top_coins: List[Dict] = []
+        self._top_coins_n: int = 0
     
     def get_state(self) -> WatchState:
         """Get current watch state."""
@@ -84,7 +167,9 @@ class WatcherService:
     def save_state(self):
         """Save current watch state."""
         if self._state:
-            self.watch_state_store.save(self._state)
+            with self._state_lock:
+                self.watch_state_store.save(self._state)
+                self._last_state_flush = time.time()
     
     def start(self):
         """Start the watcher polling loop."""
@@ -97,6 +182,9 @@ class WatcherService:
         state.config.enabled = True
         self.save_state()
         
+        self._stop_event.clear()
+        self._start_fill_consumer()
+        self._start_sender()
         self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
         self._poll_thread.start()
         logger.info("Watcher started")
@@ -110,9 +198,163 @@ class WatcherService:
         
         state.is_running = False
         state.config.enabled = False
+        self._stop_event.set()
+        
+        # Wake the poll loop out of its sleep and wait for it to finish the tick
+        poll_thread = self._poll_thread
+        if poll_thread and poll_thread.is_alive() and poll_thread is not threading.current_thread():
+            poll_thread.join(timeout=5)
+        if self.hl_client is not None:
+            self.hl_client.close()
+        self._stop_fill_consumer()
+        self._stop_sender()
+        # Final save once no other thread can still mutate the state
         self.save_state()
         logger.info("Watcher stopped")
     
+    def _start_fill_consumer(self):
+        """Start the thread that feeds queued snapshots into the fill model."""
+        if self._fill_thread is None or not self._fill_thread.is_alive():
+            self._fill_thread = threading.Thread(target=self._fill_consumer, daemon=True)
+            self._fill_thread.start()
+    
+    def _stop_fill_consumer(self):
+        """Drain remaining snapshots and stop the consumer thread."""
+        fill_thread = self._fill_thread
+        if fill_thread and fill_thread.is_alive():
+            self._fill_queue.put(None)
+            fill_thread.join(timeout=5)
+    
+    def _fill_consumer(self):
+        """Consume queued L2 snapshots and record them in the fill model."""
+        fill_queue = self._fill_queue
+        while True:
+            item = fill_queue.get()
+            if item is None:
+                break
+            coin, mid, bid, ask, spread, depth_top = item
+            try:
+                self.fill_model.add_snapshot(coin, {
+                    "mid": mid,
+                    "bid": bid,
+                    "ask": ask,
+                    "spread": spread,
+                    "depth_top": depth_top,
+                })
+            except Exception as e:
+                logger.error(f"Error recording fill snapshot for {coin}: {e}")
+    
+    def _start_sender(self):
+        """Start the thread that creates and sends queued proposals."""
+        if self._sender_thread is None or not self._sender_thread.is_alive():
+            self._sender_thread = threading.Thread(target=self._sender, daemon=True)
+            self._sender_thread.start()
+    
+    def _stop_sender(self):
+        """Send remaining queued proposals and stop the sender thread."""
+        sender_thread = self._sender_thread
+        if sender_thread and sender_thread.is_alive():
+            self._send_queue.put(None)
+            sender_thread.join(timeout=10)
+    
+    def _enqueue_proposal(self, job: tuple) -> bool:
+        """Hand a proposal job to the sender thread without blocking.
+        
+        Args:
+            job: (coin, side, alert_key, current_time, iso_now, score_result,
+                proposal_snapshot, plan_params) tuple
+        
+        Returns:
+            True if queued, False if the queue is full and the alert was dropped
+        """
+        alert_key = job[2]
+        with self._state_lock:
+            self._pending_alert_keys.add(alert_key)
+        try:
+            self._send_queue.put_nowait(job)
+        except queue.Full:
+            with self._state_lock:
+                self._pending_alert_keys.discard(alert_key)
+            logger.warning(f"Send queue full, dropping proposal for {alert_key}")
+            return False
+        self._last_proposal_queued = job[3]
+        return True
+    
+    def _sender(self):
+        """Consume queued proposal jobs: create, persist, format and send."""
+        send_queue = self._send_queue
+        while True:
+            job = send_queue.get()
+            if job is None:
+                break
+            try:
+                self._send_proposal(*job)
+            except Exception as e:
+                logger.error(f"Error sending proposal for {job[2]}: {e}", exc_info=True)
+            finally:
+                with self._state_lock:
+                    self._pending_alert_keys.discard(job[2])
+    
+    def _send_proposal(
+        self,
+        coin: str,
+        side: str,
+        alert_key: str,
+        current_time: float,
+        iso_now: str,
+        score_result: SafeEntryScore,
+        proposal_snapshot: Dict,
+        plan_params: Dict,
+    ):
+        """Create a proposal, send it to Telegram and record the alert on success."""
+        # Plan defaults from the cached app state (re-read only when the file changes)
+        _, app_state = self.state_store.load_cached()
+        plan = app_state.plan
+        
+        proposal = create_proposal_from_snapshot(
+            proposal_snapshot,
+            coin,
+            side,
+            {
+                "margin": plan.default_margin,
+                "leverage": plan.default_leverage,
+                **plan_params,
+            },
+            self.settings,
+        )
+        
+        # Merge the proposal into the latest on-disk state under the lock
+        self.state_store.update_atomic(
+            lambda s: s.proposals.__setitem__(proposal.id, proposal)
+        )
+        
+        # Format and send message
+        text, reply_markup = format_proposal_message(proposal, self.settings)
+        
+        if not self.telegram_client.send_message(text, reply_markup=reply_markup):
+            return
+        
+        # Store chat_id in proposal
+        proposal.chat_id = int(self.telegram_client.chat_id) if self.telegram_client.chat_id else None
+        
+        state = self.get_state()
+        with self._state_lock:
+            state.last_alert_ts[alert_key] = current_time
+            state.last_proposal_time = current_time
+            self._alert_times.append(current_time)
+            state.record_alert(current_time)
+            state.last_alerts.append({
+                "coin": coin,
+                "side": side,
+                "timestamp": iso_now,
+                "timestamp_ts": current_time,
+                "score": score_result.total_score,
+                "reasons": score_result.reasons,
+                "proposal_id": proposal.id,
+            })
+            self.save_state()
+        logger.info(f"Proposal sent: {coin} {side} (score: {score_result.total_score:.1f}, proposal: {proposal.id})")
+    
     def update_config(self, config: WatchConfig):
         """Update watch configuration."""
         state = self.get_state()
@@ -137,54 +379,7 @@ class WatcherService:
             universe, contexts = self.hl_client.fetch_market_data()
             
             # Get top N coins
-            coins_with_data = []
-            for i, u in enumerate(universe):
-                coin_name = u.get("name")
-                if coin_name and i < len(contexts):
-                    ctx = contexts[i]
-                    if not isinstance(ctx, dict):
-                        continue
-                    
-                    # Extract funding safely
-                    funding_value = 0.0
-                    funding_field = ctx.get("funding")
-                    if isinstance(funding_field, dict):
-                        funding_value = float(funding_field.get("funding", 0))
-                    elif isinstance(funding_field, (int, float)):
-                        funding_value = float(funding_field)
-                    elif isinstance(funding_field, str):
-                        try:
-                            funding_value = float(funding_field)
-                        except (ValueError, TypeError):
-                            funding_value = 0.0
-                    
-                    # Helper to extract float from dict, handling strings
-                    def _to_float(d: dict, key: str, default: float = 0.0) -> float:
-                        val = d.get(key, default)
-                        if isinstance(val, (int, float)):
-                            return float(val)
-                        elif isinstance(val, str):
-                            try:
-                                return float(val)
-                            except (ValueError, TypeError):
-                                return default
-                        return default
-                    
-                    coins_with_data.append({
-                        "coin": coin_name,
-                        "dayNtlVlm": _to_float(ctx, "dayNtlVlm", 0),
-                        "data": {
-                            "maxLeverage": _to_float(u, "maxLeverage", 0),
-                            "onlyIsolated": u.get("onlyIsolated", False),
-                            "marginMode": u.get("marginMode"),
-                            "funding": funding_value,
-                            "markPx": _to_float(ctx, "markPx", 0),
-                            "midPx": _to_float(ctx, "midPx", 0),
-                            "oraclePx": _to_float(ctx, "oraclePx", 0),
-                            "openInterest": _to_float(ctx, "openInterest", 0),
-                            "dayNtlVlm": _to_float(ctx, "dayNtlVlm", 0),
-                        }
-                    })
+            coins_with_data = _parse_coins(universe, contexts)
             
             coins_with_data.sort(key=lambda x: x["dayNtlVlm"], reverse=True)
             top_coins = coins_with_data[:state.config.top_n]
@@ -208,7 +403,7 @@ class WatcherService:
                 
                 score_result = evaluate_safe_entry(
                     coin, coin_data, l2_book, state.config,
-                    score_threshold=80.0
+                    score_threshold=self._score_threshold
                 )
                 
                 if score_result and score_result.passed:
@@ -226,23 +421,33 @@ class WatcherService:
     def _check_rate_limit(self) -> bool:
         """Check if we're within global rate limit.
         
+        Alerts still waiting in the send queue count against the limit too.
+        
         Returns:
             True if we can send an alert, False if rate limited
         """
         current_time = time.time()
-        # Remove alerts older than 1 hour
-        while self._alert_times and current_time - self._alert_times[0] > 3600:
-            self._alert_times.popleft()
-        
-        return len(self._alert_times) < self._max_alerts_per_hour
+        # The sender thread appends to _alert_times and drains _pending_alert_keys
+        with self._state_lock:
+            # Advance past alerts older than 1 hour
+            alert_times = self._alert_times
+            self._alert_low = bisect.bisect_left(alert_times, current_time - 3600, self._alert_low)
+            
+            # Compact occasionally so the list does not grow without bound
+            if self._alert_low > 1000:
+                del alert_times[:self._alert_low]
+                self._alert_low = 0
+            
+            in_flight = len(alert_times) - self._alert_low + len(self._pending_alert_keys)
+        return in_flight < self._max_alerts_per_hour
     
     def _should_trigger_alert(
         self,
         alert_key: str,
         score: float,
         threshold: float,
-        debounce_count: int = 3,
-        hysteresis: float = 5.0,
+        debounce_count: Optional[int] = None,
+        hysteresis: Optional[float] = None,
     ) -> bool:
         """Check if alert should trigger with debouncing and hysteresis.
         
@@ -250,12 +455,18 @@ class WatcherService:
             alert_key: Unique key for coin+side
             score: Current score
             threshold: Pass threshold
-            debounce_count: Number of consecutive passes needed
-            hysteresis: Hysteresis band (clear only if score <= threshold - hysteresis)
+            debounce_count: Number of consecutive passes needed (default: self._debounce_count)
+            hysteresis: Hysteresis band (clear only if score <= threshold - hysteresis;
+                default: self._hysteresis)
         
         Returns:
             True if alert should trigger
         """
+        if debounce_count is None:
+            debounce_count = self._debounce_count
+        if hysteresis is None:
+            hysteresis = self._hysteresis
+        
         if alert_key not in self._alert_states:
             self._alert_states[alert_key] = AlertState()
         
@@ -280,6 +491,31 @@ class WatcherService:
         
         return state.armed
     
+    def _rebuild_universe_cache(self, universe: List[Dict], contexts: List[Dict], top_n: int):
+        """Parse a fresh metaAndAssetCtxs response and pick the top coins.
+        
+        Called only when market metadata is refreshed, so ticks in between
+        reuse the parsed coins instead of re-walking the universe.
+        
+        Args:
+            universe: Universe list from the API
+            contexts: Asset contexts aligned with universe
+            top_n: Number of coins to keep, by day notional volume
+        """
+        coins_with_data = _parse_coins(universe, contexts)
+        self._parsed_universe = coins_with_data
+        self._universe_vlm = [c["dayNtlVlm"] for c in coins_with_data]
+        self._select_top_coins(top_n)
+    
+    def _select_top_coins(self, top_n: int):
+        """Pick the top_n parsed coins by day notional volume."""
+        vlm = self._universe_vlm
+        parsed = self._parsed_universe
+        # Rank indices against the flat volume column; list.__getitem__ keeps the key in C
+        top_idx = heapq.nlargest(top_n, range(len(vlm)), key=vlm.__getitem__)
+        self._top_coins = [parsed[i] for i in top_idx]
+        self._top_coins_n = top_n
+    
     def _poll_loop(self):
         """Background polling loop with improved staggering."""
         state = self.get_state()
@@ -287,79 +523,56 @@ class WatcherService:
         
         # Cache for metaAndAssetCtxs (refresh slower)
         last_meta_fetch = 0
-        cached_universe = []
-        cached_contexts = []
         
-        while state.is_running:
+        stop_event = self._stop_event
+        while not stop_event.is_set():
             try:
                 current_time = time.time()
+                iso_now = datetime.fromtimestamp(current_time, tz=timezone.utc).isoformat()
+                
+                # Bind per-tick config to locals for the inner loops
+                cfg = state.config
+                spam_guard = self.settings.telegram_spam_guard_sec
+                cooldown = cfg.cooldown_sec
+                open_off = cfg.open_offset_bps
+                close_off = cfg.close_offset_bps
+                fkind = cfg.funding_kind
+                telegram_on = cfg.telegram_enabled and self.telegram_client.enabled
+                score_threshold = self._score_threshold
+                
+                # Pick up pause/resume from the control plane (cheap flag read)
+                state.enabled = self.watch_state_store.is_enabled(state.enabled)
+                if not state.enabled:
+                    logger.debug("Watcher is paused, skipping L2 fetch and alerts")
+                    if stop_event.wait(cfg.poll_interval_sec):
+                        break
+                    continue
+                
+                # Drop expired mutes once per tick; the inner loop only tests membership
+                muted_coins = state.muted_coins
+                if muted_coins:
+                    with self._state_lock:
+                        for expired_coin in [c for c, t in muted_coins.items() if current_time >= t]:
+                            del muted_coins[expired_coin]
+                self._muted_set = frozenset(muted_coins)
+                muted = self._muted_set
                 
                 # Fetch market data (with slower refresh)
                 if current_time - last_meta_fetch > self._meta_refresh_interval:
                     try:
                         universe, contexts = self.hl_client.fetch_market_data()
-                        cached_universe = universe
-                        cached_contexts = contexts
+                        self._rebuild_universe_cache(universe, contexts, cfg.top_n)
                         last_meta_fetch = current_time
                         logger.debug("Refreshed market data cache")
                     except Exception as e:
                         logger.error(f"Error fetching market data: {e}")
-                        time.sleep(state.config.poll_interval_sec)
+                        stop_event.wait(cfg.poll_interval_sec)
                         continue
                 
-                # Helper to extract float from dict, handling strings
-                def _to_float(d: dict, key: str, default: float = 0.0) -> float:
-                    val = d.get(key, default)
-                    if isinstance(val, (int, float)):
-                        return float(val)
-                    elif isinstance(val, str):
-                        try:
-                            return float(val)
-                        except (ValueError, TypeError):
-                            return default
-                    return default
-                
-                # Get top N coins by volume
-                coins_with_data = []
-                for i, u in enumerate(cached_universe):
-                    coin_name = u.get("name")
-                    if coin_name and i < len(cached_contexts):
-                        ctx = cached_contexts[i]
-                        if not isinstance(ctx, dict):
-                            continue
-                        
-                        # Extract funding safely
-                        funding_value = 0.0
-                        funding_field = ctx.get("funding")
-                        if isinstance(funding_field, dict):
-                            funding_value = float(funding_field.get("funding", 0))
-                        elif isinstance(funding_field, (int, float)):
-                            funding_value = float(funding_field)
-                        elif isinstance(funding_field, str):
-                            try:
-                                funding_value = float(funding_field)
-                            except (ValueError, TypeError):
-                                funding_value = 0.0
-                        
-                        coins_with_data.append({
-                            "coin": coin_name,
-                            "dayNtlVlm": _to_float(ctx, "dayNtlVlm", 0),
-                            "data": {
-                                "maxLeverage": _to_float(u, "maxLeverage", 0),
-                                "onlyIsolated": u.get("onlyIsolated", False),
-                                "marginMode": u.get("marginMode"),
-                                "funding": funding_value,
-                                "markPx": _to_float(ctx, "markPx", 0),
-                                "midPx": _to_float(ctx, "midPx", 0),
-                                "oraclePx": _to_float(ctx, "oraclePx", 0),
-                                "openInterest": _to_float(ctx, "openInterest", 0),
-                                "dayNtlVlm": _to_float(ctx, "dayNtlVlm", 0),
-                            }
-                        })
-                
-                # Sort by volume and take top N
-                coins_with_data.sort(key=lambda x: x["dayNtlVlm"], reverse=True)
-                top_coins = coins_with_data[:state.config.top_n]
+                # Top N coins by volume (re-derived only when meta or top_n changes)
+                if self._top_coins_n != cfg.top_n:
+                    self._select_top_coins(cfg.top_n)
+                top_coins = self._top_coins
                 
                 # Round-robin L2 polling: process subset each tick
                 coins_per_tick = max(1, len(top_coins) // 3)  # Process 1/3 each tick
@@ -371,43 +584,55 @@ class WatcherService:
                 
                 self._l2_poll_index = (self._l2_poll_index + coins_per_tick) % len(top_coins) if top_coins else 0
                 
-                # Staggered polling interval
-                min_coin_interval = max(
-                    self.settings.poll_interval_floor_sec,
-                    state.config.poll_interval_sec / len(coins_to_poll) if coins_to_poll else 2.0
-                )
+                # Fetch all L2 books for this tick concurrently
+                books = self.hl_client.get_l2_books_batch([ci["coin"] for ci in coins_to_poll])
                 
                 snapshot = {}
-                for coin_info in coins_to_poll:
-                    if not state.is_running:
+                for coin_info, l2_book in zip(coins_to_poll, books):
+                    if stop_event.is_set():
                         break
                     
                     coin = coin_info["coin"]
                     coin_data = coin_info["data"]
                     
-                    # Fetch L2 book
-                    l2_book = self.hl_client.get_l2_book(coin)
                     if not l2_book:
-                        time.sleep(min_coin_interval)
                         continue
                     
-                    # Add snapshot for fill model
-                    self.fill_model.add_snapshot(coin, {
-                        "mid": l2_book.get("mid", 0),
-                        "bid": l2_book.get("best_bid", 0),
-                        "ask": l2_book.get("best_ask", 0),
-                        "spread": l2_book.get("spread_bps", 0),
-                        "depth_top": l2_book.get("depth_top", 0),
-                    })
+                    # Hand the snapshot to the fill model consumer thread
+                    self._fill_queue.put((
+                        coin,
+                        l2_book.get("mid", 0),
+                        l2_book.get("best_bid", 0),
+                        l2_book.get("best_ask", 0),
+                        l2_book.get("spread_bps", 0),
+                        l2_book.get("depth_top", 0),
+                    ))
                     
-                    # Evaluate safe entry with scoring
-                    score_result = evaluate_safe_entry(
-                        coin, coin_data, l2_book, state.config,
-                        score_threshold=80.0  # Default threshold
+                    # Evaluate safe entry with scoring, reusing the last result if nothing moved
+                    score_key = (
+                        l2_book.get("best_bid", 0),
+                        l2_book.get("best_ask", 0),
+                        coin_data.get("markPx", 0),
+                        coin_data.get("oraclePx", 0),
+                        coin_data.get("funding", 0),
+                        coin_data.get("dayNtlVlm", 0),
+                        fkind,
+                        cfg.side,
+                        open_off,
+                        close_off,
+                        score_threshold,
                     )
+                    cached = self._score_cache.get(coin)
+                    if cached is not None and cached[0] == score_key:
+                        score_result = cached[1]
+                    else:
+                        score_result = evaluate_safe_entry(
+                            coin, coin_data, l2_book, cfg,
+                            score_threshold=score_threshold
+                        )
+                        self._score_cache[coin] = (score_key, score_result)
                     
                     if not score_result:
-                        time.sleep(min_coin_interval)
                         continue
                     
                     # Store in snapshot
@@ -429,27 +654,14 @@ class WatcherService:
                     # Get safe sides from score result
                     safe_sides = score_result.metrics.get("safe_sides", [])
                     
-                    # Check if watcher is enabled
-                    if not state.enabled:
-                        logger.debug("Watcher is paused, skipping alerts")
-                        time.sleep(min_coin_interval)
-                        continue
-                    
                     # Check mute
-                    if coin in state.muted_coins:
-                        unmute_time = state.muted_coins[coin]
-                        if time.time() < unmute_time:
-                            logger.debug(f"Coin {coin} is muted until {unmute_time}")
-                            time.sleep(min_coin_interval)
-                            continue
-                        else:
-                            # Expired mute, clean up
-                            state.muted_coins.pop(coin)
+                    if coin in muted:
+                        logger.debug(f"Coin {coin} is muted until {state.muted_coins[coin]}")
+                        continue
                     
-                    # Check spam guard
-                    if current_time - state.last_proposal_time < self.settings.telegram_spam_guard_sec:
+                    # Check spam guard (counting proposals still waiting to be sent)
+                    if current_time - max(state.last_proposal_time, self._last_proposal_queued) < spam_guard:
                         logger.debug("Spam guard: skipping proposal")
-                        time.sleep(min_coin_interval)
                         continue
                     
                     # Check each side with debouncing
@@ -459,14 +671,18 @@ class WatcherService:
                             continue
                         
                         alert_key = f"{coin}_{side}"
+                        with self._state_lock:
+                            already_queued = alert_key in self._pending_alert_keys
+                        if already_queued:
+                            continue
                         
                         # Check debouncing/hysteresis
-                        if not self._should_trigger_alert(alert_key, score_result.total_score, 80.0):
+                        if not self._should_trigger_alert(alert_key, score_result.total_score, score_threshold):
                             continue
                         
                         # Check per-coin+side cooldown
                         last_alert = state.last_alert_ts.get(alert_key, 0)
-                        if current_time - last_alert < state.config.cooldown_sec:
+                        if current_time - last_alert < cooldown:
                             continue
                         
                         # Check global rate limit
@@ -478,24 +694,24 @@ class WatcherService:
                         open_limit_px = side_info.get("open_limit_px", 0)
                         close_limit_px = side_info.get("close_limit_px", 0)
                         
-                        # Estimate fill probabilities
-                        spread_bps = score_result.metrics.get("spread_bps", 0)
-                        depth_top = score_result.metrics.get("depth_top", 5000.0)
-                        notional = 1000.0  # Default assumption, could be from config
-                        
-                        fill_prob_open = self.fill_model.estimate_fill_prob(
-                            coin, spread_bps, depth_top, notional,
-                            state.config.open_offset_bps
-                        )
-                        fill_prob_close = self.fill_model.estimate_fill_prob(
-                            coin, spread_bps, depth_top, notional,
-                            state.config.close_offset_bps
-                        )
-                        
                         # Create proposal and send interactive message
-                        if state.config.telegram_enabled and self.telegram_client.enabled:
-                            # Build snapshot for proposal
-                            snapshot = {
+                        if telegram_on:
+                            # Estimate fill probabilities (only needed for the proposal)
+                            spread_bps = score_result.metrics.get("spread_bps", 0)
+                            depth_top = score_result.metrics.get("depth_top", 5000.0)
+                            notional = self._fill_notional
+                            
+                            fill_prob_open = self.fill_model.estimate_fill_prob(
+                                coin, spread_bps, depth_top, notional,
+                                open_off
+                            )
+                            fill_prob_close = self.fill_model.estimate_fill_prob(
+                                coin, spread_bps, depth_top, notional,
+                                close_off
+                            )
+                            
+                            # Build snapshot for proposal (kept apart from the per-tick snapshot)
+                            proposal_snapshot = {
                                 "score": score_result.total_score,
                                 "reasons": score_result.reasons,
                                 "metrics": score_result.metrics,
@@ -505,70 +721,45 @@ class WatcherService:
                                 },
                             }
                             
-                            # Get plan defaults from state
-                            app_state = self.state_store.load()
-                            
-                            # Create proposal
-                            proposal = create_proposal_from_snapshot(
-                                snapshot,
+                            # The sender thread creates, persists and sends the proposal
+                            self._enqueue_proposal((
                                 coin,
                                 side,
+                                alert_key,
+                                current_time,
+                                iso_now,
+                                score_result,
+                                proposal_snapshot,
                                 {
-                                    "margin": app_state.plan.default_margin,
-                                    "leverage": app_state.plan.default_leverage,
                                     "hold_min": 60,
                                     "fee_mode": "maker",
-                                    "funding_kind": state.config.funding_kind,
-                                    "open_offset_bps": state.config.open_offset_bps,
-                                    "close_offset_bps": state.config.close_offset_bps,
+                                    "funding_kind": fkind,
+                                    "open_offset_bps": open_off,
+                                    "close_offset_bps": close_off,
                                 },
-                                self.settings,
-                            )
-                            
-                            # Store proposal in state (already loaded above)
-                            app_state.proposals[proposal.id] = proposal
-                            self.state_store.save(app_state)
-                            
-                            # Format and send message
-                            text, reply_markup = format_proposal_message(proposal, self.settings)
-                            
-                            if self.telegram_client.send_message(text, reply_markup=reply_markup):
-                                # Store message_id and chat_id in proposal
-                                proposal.chat_id = int(self.telegram_client.chat_id) if self.telegram_client.chat_id else None
-                                
-                                state.last_alert_ts[alert_key] = current_time
-                                state.last_proposal_time = current_time
-                                self._alert_times.append(current_time)
-                                state.last_alerts.append({
-                                    "coin": coin,
-                                    "side": side,
-                                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                                    "timestamp_ts": current_time,
-                                    "score": score_result.total_score,
-                                    "reasons": score_result.reasons,
-                                    "proposal_id": proposal.id,
-                                })
-                                logger.info(f"Proposal sent: {coin} {side} (score: {score_result.total_score:.1f}, proposal: {proposal.id})")
+                            ))
                         
                         # Update snapshot
-                        state.last_safe_snapshot[coin] = {
-                            "score": score_result.total_score,
-                            "metrics": score_result.metrics,
-                            "reasons": score_result.reasons,
-                        }
-                    
-                    time.sleep(min_coin_interval)
+                        with self._state_lock:
+                            state.last_safe_snapshot[coin] = {
+                                "score": score_result.total_score,
+                                "metrics": score_result.metrics,
+                                "reasons": score_result.reasons,
+                            }
                 
-                # Update last poll time and snapshot
-                state.last_poll_time = datetime.now(timezone.utc).isoformat()
+                # Update last poll time and snapshot; persist every few seconds
+                # (the sender thread saves right after each alert it sends)
+                state.last_poll_time = iso_now
                 self._last_snapshot = snapshot
-                self.save_state()
+                if current_time - self._last_state_flush >= _STATE_FLUSH_INTERVAL_SEC:
+                    self.save_state()
                 
-                # Sleep until next poll cycle
+                # Sleep until next poll cycle (at least the floor between L2 bursts)
                 elapsed = time.time() - current_time
-                sleep_time = max(0, state.config.poll_interval_sec - elapsed)
-                time.sleep(sleep_time)
+                sleep_time = max(self.settings.poll_interval_floor_sec, cfg.poll_interval_sec - elapsed)
+                if stop_event.wait(timeout=sleep_time):
+                    break
                 
             except Exception as e:
                 logger.error(f"Error in watch poll loop: {e}", exc_info=True)
-                time.sleep(state.config.poll_interval_sec)
+                stop_event.wait(state.config.poll_interval_sec)
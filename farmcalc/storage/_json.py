@@ -0,0 +1,73 @@
+"""JSON encoding and atomic file writes for the stores, using orjson when installed."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Indent store files for human inspection; off by default to keep them small
+_PRETTY = os.environ.get("FARMCALC_PRETTY_JSON") == "1"
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize data to JSON bytes for a store file.
+    
+    Output is compact unless FARMCALC_PRETTY_JSON=1, which indents it for
+    reading by hand.
+    
+    Args:
+        data: JSON-compatible value
+    
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if not _PRETTY:
+        return dumps_line(data)
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def dumps_line(data: Any) -> bytes:
+    """Serialize data to compact single-line JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def loads(raw: bytes) -> Any:
+    """Parse JSON from bytes read in a single call."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_bytes(path: Path) -> Optional[bytes]:
+    """Read a whole file in one call, or return None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_atomic(path: Path, data: Any):
+    """Write data as JSON to path via a synced temp file and os.replace.
+    
+    Readers see either the old file or the new one, never a partial write.
+    
+    Args:
+        path: Destination file
+        data: JSON-compatible value
+    """
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
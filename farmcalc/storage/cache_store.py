@@ -1,21 +1,78 @@
 """File-based cache for external API data."""
 
-import json
+import hashlib
 import logging
+import os
+import re
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from . import _json
 
 logger = logging.getLogger(__name__)
 
+# Shard file names: blake2b-8 hex digest of the key
+_SHARD_NAME = re.compile(r"[0-9a-f]{16}\.json")
+
 
 class CacheStore:
-    """Simple file-based cache with TTL."""
+    """Simple file-based cache with TTL, one file per key."""
     
-    def __init__(self, cache_path: Path, ttl_sec: float):
-        """Initialize cache with path and TTL."""
-        self.cache_path = cache_path
+    def __init__(self, cache_dir: Path, ttl_sec: float):
+        """Initialize cache with directory and TTL.
+        
+        A path to a JSON file (the pre-sharding single-file cache) is taken to
+        mean its parent directory, so old configs keep caching.
+        """
+        if cache_dir.suffix == ".json" or cache_dir.is_file():
+            logger.warning(
+                f"Cache path {cache_dir} is a file; caching in {cache_dir.parent} instead"
+            )
+            cache_dir = cache_dir.parent
+        self.cache_dir = cache_dir
         self.ttl_sec = ttl_sec
+        # key -> ((mtime_ns, size) of its file when read, parsed entry)
+        self._mem: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        # Earliest time the next directory sweep may run (one sweep per TTL)
+        self._next_eviction: float = 0.0
+    
+    def _key_path(self, key: str) -> Path:
+        """Return the shard file for key."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+    
+    @staticmethod
+    def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of path, or None if missing."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for key, re-reading its file only when it changed."""
+        path = self._key_path(key)
+        signature = self._stat_signature(path)
+        if signature is None:
+            self._mem.pop(key, None)
+            return None
+        
+        cached = self._mem.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        try:
+            raw = _json.read_bytes(path)
+            entry = _json.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.warning(f"Error reading cache: {e}")
+            return None
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+        self._mem[key] = (signature, entry)
+        return entry
     
     def get(self, key: str) -> Optional[Any]:
         """Get cached value if not expired.
@@ -26,52 +83,89 @@ class CacheStore:
         Returns:
             Cached value or None if not found/expired
         """
-        if not self.cache_path.exists():
+        entry = self._entry(key)
+        if not entry:
             return None
         
-        try:
-            with open(self.cache_path, "r") as f:
-                cache_data = json.load(f)
-            
-            entry = cache_data.get(key)
-            if not entry:
-                return None
-            
-            # Check TTL
-            cached_time = entry.get("timestamp", 0)
-            if time.time() - cached_time > self.ttl_sec:
-                logger.debug(f"Cache entry {key} expired")
-                return None
-            
-            return entry.get("value")
-        except Exception as e:
-            logger.warning(f"Error reading cache: {e}")
+        # Check TTL
+        cached_time = entry.get("timestamp", 0)
+        if time.time() - cached_time > self.ttl_sec:
+            logger.debug(f"Cache entry {key} expired")
             return None
+        
+        return entry.get("value")
     
     def set(self, key: str, value: Any):
         """Set cached value with current timestamp.
         
+        Only this key's file is rewritten (atomically), so no other key is
+        read or merged. At most once per TTL, files older than the TTL are
+        removed on the way.
+        
         Args:
             key: Cache key
             value: Value to cache
         """
-        cache_data = {}
-        if self.cache_path.exists():
-            try:
-                with open(self.cache_path, "r") as f:
-                    cache_data = json.load(f)
-            except Exception:
-                cache_data = {}
-        
-        cache_data[key] = {
+        now = time.time()
+        entry = {
+            "key": key,
             "value": value,
-            "timestamp": time.time(),
+            "timestamp": now,
         }
+        path = self._key_path(key)
         
         try:
-            with open(self.cache_path, "w") as f:
-                json.dump(cache_data, f, indent=2)
+            try:
+                _json.write_atomic(path, entry)
+            except FileNotFoundError:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                _json.write_atomic(path, entry)
+            self._mem[key] = (self._stat_signature(path), entry)
             logger.debug(f"Cached {key}")
         except Exception as e:
+            self._mem.pop(key, None)
             logger.warning(f"Error writing cache: {e}")
-
+            return
+        
+        if now >= self._next_eviction:
+            self._next_eviction = now + self.ttl_sec
+            self._evict_expired(now)
+    
+    def _evict_expired(self, now: float):
+        """Delete shard files whose last write is older than the TTL.
+        
+        Only files named like a shard and holding the key that hashes to that
+        name are removed, so unrelated files in a shared directory are kept.
+        """
+        cutoff = now - self.ttl_sec
+        try:
+            with os.scandir(self.cache_dir) as it:
+                stale = [
+                    dir_entry.path
+                    for dir_entry in it
+                    if _SHARD_NAME.fullmatch(dir_entry.name)
+                    and dir_entry.stat().st_mtime < cutoff
+                ]
+        except OSError as e:
+            logger.debug(f"Cache eviction skipped: {e}")
+            return
+        
+        for path in stale:
+            if self._is_own_shard(Path(path)):
+                try:
+                    os.unlink(path)
+                except OSError as e:
+                    logger.debug(f"Cache eviction skipped {path}: {e}")
+    
+    def _is_own_shard(self, path: Path) -> bool:
+        """Check that path holds a cache entry whose key hashes to its name."""
+        try:
+            raw = _json.read_bytes(path)
+            entry = _json.loads(raw) if raw is not None else None
+        except Exception:
+            return False
+        return (
+            isinstance(entry, dict)
+            and isinstance(entry.get("key"), str)
+            and self._key_path(entry["key"]).name == path.name
+        )
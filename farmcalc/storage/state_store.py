@@ -1,18 +1,100 @@
 """State persistence for farmcalc."""
 
+import copy
 import fcntl
-import json
 import logging
+import math
+import os
+import threading
 from contextlib import contextmanager
-from dataclasses import asdict
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from . import _json
 from ..models.domain import Plan, Proposal, ProposalStatus, State, Stats, Trade, WatchConfig, WatchState, WatchThresholds
+from ..services.proposals import _parse_iso
 
 logger = logging.getLogger(__name__)
 
 
+def _next_expiry_ts(proposals: Dict[str, Proposal]) -> Optional[float]:
+    """Earliest expiry timestamp among pending proposals, or None if none pending.
+    
+    Returns 0.0 (always due) if an expiry cannot be parsed, so callers fall
+    back to a full expire pass.
+    """
+    try:
+        expiries = [
+            _parse_iso(p.expires_at).timestamp()
+            for p in proposals.values()
+            if p.status is ProposalStatus.PENDING
+        ]
+    except ValueError:
+        return 0.0
+    return min(expiries) if expiries else None
+
+
+# Stands in for a next_expiry_ts the snapshot never stored; unequal to any value
+_NO_STORED_EXPIRY = object()
+
+# Top-level state fields replayed from the delta log with a plain "set"
+_SET_KEYS = ("plan", "stats", "watcher_enabled", "schema_version", "next_expiry_ts")
+
+
+def _diff_state(before: Dict[str, Any], after: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Describe how a serialized state changed as delta log records.
+    
+    Args:
+        before: Serialized state before the update
+        after: Serialized state after the update
+    
+    Returns:
+        List of records (empty if nothing changed), or None if the change
+        cannot be expressed as upserts (trades removed or reordered,
+        proposals deleted) and the snapshot must be rewritten instead
+    """
+    deltas = [{"op": "set", "key": k, "value": after[k]} for k in _SET_KEYS if before[k] != after[k]]
+    
+    old_trades = before["trades"]
+    new_trades = after["trades"]
+    new_ids = [t["id"] for t in new_trades]
+    if [t["id"] for t in old_trades] != new_ids[:len(old_trades)] or len(set(new_ids)) != len(new_ids):
+        return None
+    old_by_id = {t["id"]: t for t in old_trades}
+    deltas.extend({"op": "upsert_trade", "value": t} for t in new_trades if old_by_id.get(t["id"]) != t)
+    
+    old_proposals = before["proposals"]
+    new_proposals = after["proposals"]
+    if old_proposals.keys() - new_proposals.keys():
+        return None
+    deltas.extend(
+        {"op": "upsert_proposal", "id": pid, "value": p}
+        for pid, p in new_proposals.items()
+        if old_proposals.get(pid) != p
+    )
+    return deltas
+
+
+def _apply_delta(data: Dict[str, Any], delta: Dict[str, Any]):
+    """Replay one delta log record onto serialized state in place."""
+    op = delta["op"]
+    if op == "set":
+        data[delta["key"]] = delta["value"]
+    elif op == "upsert_trade":
+        trade = delta["value"]
+        trades = data.setdefault("trades", [])
+        for i, t in enumerate(trades):
+            if t.get("id") == trade["id"]:
+                trades[i] = trade
+                break
+        else:
+            trades.append(trade)
+    elif op == "upsert_proposal":
+        data.setdefault("proposals", {})[delta["id"]] = delta["value"]
+    else:
+        logger.warning(f"Unknown state log op {op!r}, skipping")
+
+
 class StateStore:
     """Manages persistence of farmcalc state with atomic updates."""
     
@@ -20,65 +102,192 @@ class StateStore:
         """Initialize with state file path."""
         self.state_path = state_path
         self.lock_path = state_path.with_suffix(state_path.suffix + ".lock")
+        self._lock_fd: Optional[int] = None
+        self._lock_mutex = threading.Lock()
+        self.log_path = state_path.with_suffix(state_path.suffix + ".log")
+        # Sidecar holding only next_expiry_ts, so the expiry peek skips parsing the state
+        self.expiry_path = state_path.with_suffix(state_path.suffix + ".expiry")
+        self._expiry_cached: Optional[Tuple[Optional[Tuple[int, int]], Optional[float]]] = None
+        self._version = 0
+        self._cached: Optional[Tuple[Tuple[Optional[Tuple[int, int]], ...], State]] = None
     
     @contextmanager
     def _lock(self):
-        """Acquire file lock for atomic updates."""
-        lock_file = open(self.lock_path, "w")
-        try:
-            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
-            yield
-        finally:
-            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
-            lock_file.close()
+        """Acquire file lock for atomic updates.
+        
+        The lock file descriptor is opened once and reused. flock() does not
+        exclude threads sharing that descriptor, so a mutex guards it in-process.
+        """
+        with self._lock_mutex:
+            if self._lock_fd is None:
+                self._lock_fd = os.open(self.lock_path, os.O_WRONLY | os.O_CREAT, 0o644)
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+    
+    def __del__(self):
+        """Close the lock file descriptor."""
+        if getattr(self, "_lock_fd", None) is not None:
+            os.close(self._lock_fd)
     
-    def update_atomic(self, fn: Callable[[State], None]):
+    def update_atomic(self, fn: Callable[[State], Any]) -> Any:
         """Update state atomically with file locking.
         
+        Only the trades, proposals and fields that fn changed are appended to
+        the delta log; the snapshot is rewritten when the log outgrows it or
+        the change cannot be expressed as upserts.
+        
         Args:
             fn: Function that takes State and modifies it in place
+        
+        Returns:
+            Whatever fn returned
         """
         with self._lock():
-            state = self.load()
-            fn(state)
-            self.save(state)
+            state, snapshot_schema, stored_next_expiry = self._load_with_meta()
+            # Deep-copy the records, so in-place edits of nested dicts/lists by fn
+            # still show up in the diff
+            before = copy.deepcopy(self._document(state))
+            # Compare against what is on disk, so a recomputed expiry gets persisted
+            before["next_expiry_ts"] = stored_next_expiry
+            result = fn(state)
+            after = self._serialize(state)
+            deltas = _diff_state(before, after)
+            if deltas is None or snapshot_schema is None or snapshot_schema < 2:
+                self.save(state)
+            else:
+                if deltas:
+                    self._append_log(deltas)
+                if self._log_outgrew_snapshot():
+                    self.save(state)
+                elif (
+                    after["next_expiry_ts"] != before["next_expiry_ts"]
+                    or not self.expiry_path.exists()
+                ):
+                    self._write_expiry(after["next_expiry_ts"])
+        return result
     
-    def load(self) -> State:
-        """Load state from JSON file."""
-        if self.state_path.exists():
+    @staticmethod
+    def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of path, or None if missing."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _file_signature(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        """Return signatures of the snapshot file and the delta log."""
+        return self._stat_signature(self.state_path), self._stat_signature(self.log_path)
+    
+    def _append_log(self, deltas: List[Dict[str, Any]]):
+        """Append delta records to the log, one JSON document per line."""
+        with open(self.log_path, "ab") as f:
+            f.write(b"".join(_json.dumps_line(d) + b"\n" for d in deltas))
+            f.flush()
+            os.fsync(f.fileno())
+        self._version += 1
+        self._cached = None
+        logger.debug(f"Appended {len(deltas)} state change(s) to {self.log_path}")
+    
+    def _read_log(self) -> List[Dict[str, Any]]:
+        """Read delta records, stopping at a torn trailing line."""
+        raw = _json.read_bytes(self.log_path)
+        if raw is None:
+            return []
+        lines = [line for line in raw.splitlines() if line.strip()]
+        
+        # Parse the whole log with one loads call; only a torn line needs the slow path
+        try:
+            return _json.loads(b"[" + b",".join(lines) + b"]")
+        except ValueError:
+            pass
+        
+        deltas = []
+        for line in lines:
             try:
-                with open(self.state_path, "r") as f:
-                    data = json.load(f)
-                    plan = Plan(**data.get("plan", {}))
-                    stats = Stats(**data.get("stats", {}))
-                    trades = [Trade(**t) for t in data.get("trades", [])]
-                    
-                    # Handle schema version for migrations
-                    schema_version = data.get("schema_version", 1)
-                    
-                    # Migration from v1 to v2: add proposals and watcher_enabled
-                    if schema_version < 2:
-                        proposals = {}
-                        watcher_enabled = True
-                    else:
-                        proposals_data = data.get("proposals", {})
-                        proposals = {
-                            pid: Proposal(**p) for pid, p in proposals_data.items()
-                        }
-                        watcher_enabled = data.get("watcher_enabled", True)
-                    
-                    return State(
-                        plan=plan,
-                        stats=stats,
-                        trades=trades,
-                        proposals=proposals,
-                        watcher_enabled=watcher_enabled,
-                        schema_version=max(schema_version, 2),
-                    )
-            except Exception as e:
-                logger.warning(f"Error loading state: {e}, creating new state")
-        
-        return State(
+                deltas.append(_json.loads(line))
+            except ValueError:
+                logger.warning(f"Ignoring incomplete record at the end of {self.log_path}")
+                break
+        return deltas
+    
+    def _log_outgrew_snapshot(self) -> bool:
+        """True once the delta log is larger than the snapshot it applies to."""
+        log_sig, snap_sig = self._stat_signature(self.log_path), self._stat_signature(self.state_path)
+        return snap_sig is None or (log_sig is not None and log_sig[1] > snap_sig[1])
+    
+    def load_cached(self) -> Tuple[int, State]:
+        """Load state, reusing the last parsed copy if the file is unchanged.
+        
+        The returned object is shared between callers and must be treated as
+        read-only; use update_atomic() to modify state.
+        
+        Returns:
+            Tuple of (version, State); version increases on every save
+        """
+        signature = self._file_signature()
+        if self._cached is None or self._cached[0] != signature:
+            self._cached = (signature, self.load())
+        return self._version, self._cached[1]
+    
+    def load(self) -> State:
+        """Load state from the JSON snapshot and replay the delta log on top."""
+        return self._load_with_meta()[0]
+    
+    def _load_with_meta(self) -> Tuple[State, Optional[int], Any]:
+        """Load state along with metadata about what is stored on disk.
+        
+        Returns:
+            Tuple of (State, schema_version of the snapshot or None if there was
+            none, next_expiry_ts as stored or _NO_STORED_EXPIRY if absent)
+        """
+        try:
+            raw = _json.read_bytes(self.state_path)
+            if raw is not None:
+                data = _json.loads(raw)
+                snapshot_schema = data.get("schema_version", 1)
+                for delta in self._read_log():
+                    _apply_delta(data, delta)
+                stored_next_expiry = data.get("next_expiry_ts", _NO_STORED_EXPIRY)
+                plan = Plan(**data.get("plan", {}))
+                stats = Stats(**data.get("stats", {}))
+                trades = [Trade(**t) for t in data.get("trades", [])]
+                
+                # Handle schema version for migrations
+                schema_version = data.get("schema_version", 1)
+                
+                # Migration from v1 to v2: add proposals and watcher_enabled
+                if schema_version < 2:
+                    proposals = {}
+                    watcher_enabled = True
+                else:
+                    proposals_data = data.get("proposals", {})
+                    proposals = {
+                        pid: Proposal(**p) for pid, p in proposals_data.items()
+                    }
+                    watcher_enabled = data.get("watcher_enabled", True)
+                
+                state = State(
+                    plan=plan,
+                    stats=stats,
+                    trades=trades,
+                    proposals=proposals,
+                    watcher_enabled=watcher_enabled,
+                    schema_version=max(schema_version, 2),
+                    next_expiry_ts=(
+                        _next_expiry_ts(proposals)
+                        if stored_next_expiry is _NO_STORED_EXPIRY
+                        else stored_next_expiry
+                    ),
+                )
+                return state, snapshot_schema, stored_next_expiry
+        except Exception as e:
+            logger.warning(f"Error loading state: {e}, creating new state")
+        
+        state = State(
             plan=Plan(),
             stats=Stats(),
             trades=[],
@@ -86,19 +295,78 @@ class StateStore:
             watcher_enabled=True,
             schema_version=2,
         )
+        return state, None, _NO_STORED_EXPIRY
     
-    def save(self, state: State):
-        """Save state to JSON file."""
-        data = {
-            "plan": asdict(state.plan),
-            "stats": asdict(state.stats),
-            "trades": [asdict(t) for t in state.trades],
-            "proposals": {pid: asdict(p) for pid, p in state.proposals.items()},
+    def peek_next_expiry(self) -> float:
+        """Return the earliest pending proposal expiry without parsing the state.
+        
+        Reads the small expiry sidecar, re-reading it only after it changes on
+        disk. If the sidecar is missing or unreadable (state written by an older
+        version), the value comes from a plain cached load; the next save() or
+        update_atomic() writes the sidecar.
+        
+        Returns:
+            Epoch seconds of the next expiry, or math.inf if nothing is pending
+        """
+        signature = self._stat_signature(self.expiry_path)
+        if self._expiry_cached is not None and self._expiry_cached[0] == signature:
+            value = self._expiry_cached[1]
+        else:
+            value = self._read_expiry() if signature is not None else _NO_STORED_EXPIRY
+            if value is _NO_STORED_EXPIRY:
+                value = self.load_cached()[1].next_expiry_ts
+            else:
+                self._expiry_cached = (signature, value)
+        return math.inf if value is None else value
+    
+    def _read_expiry(self) -> Any:
+        """Read the expiry sidecar, or return _NO_STORED_EXPIRY if it is unusable."""
+        try:
+            raw = _json.read_bytes(self.expiry_path)
+            value = _json.loads(raw) if raw is not None else _NO_STORED_EXPIRY
+        except ValueError:
+            return _NO_STORED_EXPIRY
+        if value is None or isinstance(value, (int, float)):
+            return value
+        return _NO_STORED_EXPIRY
+    
+    def _write_expiry(self, value: Optional[float]):
+        """Persist next_expiry_ts to the sidecar read by peek_next_expiry."""
+        _json.write_atomic(self.expiry_path, value)
+        self._expiry_cached = None
+    
+    def _serialize(self, state: State) -> Dict[str, Any]:
+        """Build the JSON document for state, refreshing next_expiry_ts."""
+        state.next_expiry_ts = _next_expiry_ts(state.proposals)
+        return self._document(state)
+    
+    @staticmethod
+    def _document(state: State) -> Dict[str, Any]:
+        """Build the JSON document for state as is.
+        
+        Records are shallow dicts that share nested containers with state;
+        update_atomic deep-copies the document it diffs against.
+        """
+        return {
+            "plan": state.plan.to_dict(),
+            "stats": state.stats.to_dict(),
+            "trades": [t.to_dict() for t in state.trades],
+            "proposals": {pid: p.to_dict() for pid, p in state.proposals.items()},
             "watcher_enabled": state.watcher_enabled,
             "schema_version": state.schema_version,
+            "next_expiry_ts": state.next_expiry_ts,
         }
-        with open(self.state_path, "w") as f:
-            json.dump(data, f, indent=2)
+    
+    def save(self, state: State):
+        """Write a full snapshot of state and drop the delta log it supersedes."""
+        _json.write_atomic(self.state_path, self._serialize(state))
+        try:
+            os.unlink(self.log_path)
+        except FileNotFoundError:
+            pass
+        self._write_expiry(state.next_expiry_ts)
+        self._version += 1
+        self._cached = None
         logger.debug(f"State saved to {self.state_path}")
 
 
@@ -109,59 +377,155 @@ class WatchStateStore:
         """Initialize with state file path."""
         self.state_path = state_path
         self.lock_path = state_path.with_suffix(state_path.suffix + ".lock")
+        self._lock_fd: Optional[int] = None
+        self._lock_mutex = threading.Lock()
+        self.enabled_path = state_path.with_suffix(state_path.suffix + ".enabled")
+        self._version = 0
+        self._cached: Optional[Tuple[Tuple[Optional[Tuple[int, int]], ...], WatchState]] = None
+        # Last flag value this store wrote, with the flag file signature at that time
+        self._last_enabled: Optional[Tuple[bool, Optional[Tuple[int, int]]]] = None
     
     @contextmanager
     def _lock(self):
-        """Acquire file lock for atomic updates."""
-        lock_file = open(self.lock_path, "w")
-        try:
-            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
-            yield
-        finally:
-            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
-            lock_file.close()
+        """Acquire file lock for atomic updates.
+        
+        The lock file descriptor is opened once and reused. flock() does not
+        exclude threads sharing that descriptor, so a mutex guards it in-process.
+        """
+        with self._lock_mutex:
+            if self._lock_fd is None:
+                self._lock_fd = os.open(self.lock_path, os.O_WRONLY | os.O_CREAT, 0o644)
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+    
+    def __del__(self):
+        """Close the lock file descriptor."""
+        if getattr(self, "_lock_fd", None) is not None:
+            os.close(self._lock_fd)
     
-    def update_atomic(self, fn: Callable[[WatchState], None]):
+    def update_atomic(self, fn: Callable[[WatchState], Any]) -> Any:
         """Update watch state atomically with file locking.
         
         Args:
             fn: Function that takes WatchState and modifies it in place
+        
+        Returns:
+            Whatever fn returned
         """
         with self._lock():
             state = self.load()
-            fn(state)
+            result = fn(state)
             self.save(state)
+        return result
+    
+    @staticmethod
+    def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of path, or None if missing."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _file_signature(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        """Return signatures of the state file and the enabled flag file."""
+        return self._stat_signature(self.state_path), self._stat_signature(self.enabled_path)
+    
+    def is_enabled(self, default: bool = True) -> bool:
+        """Read the enabled flag without parsing the full watch state.
+        
+        Args:
+            default: Value returned when no flag has been written yet
+        
+        Returns:
+            Current enabled flag
+        """
+        try:
+            with open(self.enabled_path, "r") as f:
+                return f.read().strip() == "1"
+        except FileNotFoundError:
+            return default
+    
+    def set_enabled(self, enabled: bool) -> bool:
+        """Flip the enabled flag atomically without rewriting the watch state.
+        
+        Repeated calls with the value this store last wrote are skipped as
+        long as nobody else has touched the flag file since.
+        
+        Args:
+            enabled: New value of the flag
+        
+        Returns:
+            True if the flag file was written, False if the call was coalesced
+        """
+        if self._last_enabled == (enabled, self._stat_signature(self.enabled_path)):
+            return False
+        
+        tmp_path = self.enabled_path.with_suffix(self.enabled_path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            f.write("1" if enabled else "0")
+        os.replace(tmp_path, self.enabled_path)
+        self._last_enabled = (enabled, self._stat_signature(self.enabled_path))
+        self._version += 1
+        self._cached = None
+        logger.debug(f"Watch enabled flag set to {enabled}")
+        return True
+    
+    def load_cached(self) -> Tuple[int, WatchState]:
+        """Load watch state, reusing the last parsed copy if the file is unchanged.
+        
+        The returned object is shared between callers and must be treated as
+        read-only; use update_atomic() to modify watch state.
+        
+        Returns:
+            Tuple of (version, WatchState); version increases on every save
+        """
+        signature = self._file_signature()
+        if self._cached is None or self._cached[0] != signature:
+            self._cached = (signature, self.load())
+        return self._version, self._cached[1]
     
     def load(self) -> WatchState:
         """Load watch state from JSON file."""
-        if self.state_path.exists():
-            try:
-                with open(self.state_path, "r") as f:
-                    data = json.load(f)
-                    config_data = data.get("config", {})
-                    thresholds = WatchThresholds(**config_data.get("thresholds", {}))
-                    config = WatchConfig(
-                        **{k: v for k, v in config_data.items() if k != "thresholds"},
-                        thresholds=thresholds,
-                    )
-                    return WatchState(
-                        config=config,
-                        last_poll_time=data.get("last_poll_time"),
-                        last_alerts=data.get("last_alerts", []),
-                        last_alert_ts=data.get("last_alert_ts", {}),
-                        last_safe_snapshot=data.get("last_safe_snapshot", {}),
-                        is_running=False,  # Don't restore running state
-                        enabled=data.get("enabled", True),
-                        muted_coins=data.get("muted_coins", {}),
-                        last_proposal_time=data.get("last_proposal_time", 0.0),
-                    )
-            except Exception as e:
-                logger.warning(f"Error loading watch state: {e}, creating new state")
+        try:
+            raw = _json.read_bytes(self.state_path)
+            if raw is not None:
+                data = _json.loads(raw)
+                config_data = data.get("config", {})
+                thresholds = WatchThresholds(**config_data.get("thresholds", {}))
+                config = WatchConfig(
+                    **{k: v for k, v in config_data.items() if k != "thresholds"},
+                    thresholds=thresholds,
+                )
+                watch_state = WatchState(
+                    config=config,
+                    last_poll_time=data.get("last_poll_time"),
+                    last_alerts=data.get("last_alerts", []),
+                    last_alert_ts=data.get("last_alert_ts", {}),
+                    last_safe_snapshot=data.get("last_safe_snapshot", {}),
+                    is_running=False,  # Don't restore running state
+                    enabled=self.is_enabled(data.get("enabled", True)),
+                    muted_coins=data.get("muted_coins", {}),
+                    last_proposal_time=data.get("last_proposal_time", 0.0),
+                    last_bucket_minute=data.get("last_bucket_minute", 0),
+                )
+                if "alert_minute_buckets" in data:
+                    watch_state.alert_minute_buckets = data["alert_minute_buckets"]
+                else:
+                    # Older files: seed the hour counter from the alert log
+                    for alert in data.get("last_alerts", []):
+                        watch_state.record_alert(alert.get("timestamp_ts", 0))
+                return watch_state
+        except Exception as e:
+            logger.warning(f"Error loading watch state: {e}, creating new state")
         
         return WatchState(
             config=WatchConfig(),
             is_running=False,
-            enabled=True,
+            enabled=self.is_enabled(),
             muted_coins={},
             last_proposal_time=0.0,
         )
@@ -169,10 +533,7 @@ class WatchStateStore:
     def save(self, state: WatchState):
         """Save watch state to JSON file."""
         data = {
-            "config": {
-                **asdict(state.config),
-                "thresholds": asdict(state.config.thresholds),
-            },
+            "config": state.config.to_dict(),
             "last_poll_time": state.last_poll_time,
             "last_alerts": state.last_alerts[-50:],  # Keep last 50 alerts
             "last_alert_ts": state.last_alert_ts,
@@ -180,8 +541,11 @@ class WatchStateStore:
             "enabled": state.enabled,
             "muted_coins": state.muted_coins,
             "last_proposal_time": state.last_proposal_time,
+            "alert_minute_buckets": state.alert_minute_buckets,
+            "last_bucket_minute": state.last_bucket_minute,
         }
-        with open(self.state_path, "w") as f:
-            json.dump(data, f, indent=2)
+        _json.write_atomic(self.state_path, data)
+        self._version += 1
+        self._cached = None
         logger.debug(f"Watch state saved to {self.state_path}")
 
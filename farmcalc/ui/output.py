@@ -21,8 +21,8 @@ def print_disclaimer():
     console.print()
 
 
-def print_plan(plan: Plan):
-    """Print plan details."""
+def build_plan_table(plan: Plan) -> Table:
+    """Build the plan details table without printing it."""
     plan_table = Table(show_header=False, box=None)
     plan_table.add_column("Setting", style="cyan")
     plan_table.add_column("Value", style="yellow", justify="right")
@@ -34,6 +34,10 @@ def print_plan(plan: Plan):
     plan_table.add_row("Target Frozen", f"${plan.target_frozen:,.2f}")
     plan_table.add_row("Unfreeze Factor", str(plan.unfreeze_factor))
     plan_table.add_row("Level Factor", str(plan.level_factor))
-    
-    console.print(plan_table)
+    return plan_table
+
+
+def print_plan(plan: Plan):
+    """Print plan details."""
+    console.print(build_plan_table(plan))
 
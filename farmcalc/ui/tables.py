@@ -1,22 +1,51 @@
 """Rich table renderers for CLI output."""
 
-from rich.console import Console
+import heapq
+
+from rich.console import Console, Group
+from rich.panel import Panel
 from rich.table import Table
 
 from ..models.domain import State, Trade
+from ..services.calc import roundtrips_needed
+from .output import build_plan_table
 
 console = Console()
 
+# sort_by option -> coin dict key ranked descending
+_ASSET_SORT_KEYS = {
+    "funding": "funding",
+    "volume": "dayNtlVlm",
+    "oi": "openInterest",
+}
+
+
+def _money(value: float) -> str:
+    """Format a dollar amount with thousands separators and cents."""
+    return format(value, ",.2f")
+
+
+def _px(value: float) -> str:
+    """Format a price to four decimals."""
+    return format(value, ".4f")
+
+
+# Static section headers for render_status_table
+_PLAN_HEADER = Panel("[bold]Farming Plan[/bold]", style="cyan")
+_STATS_HEADER = Panel("[bold]Statistics[/bold]", style="cyan")
+
 
 def render_assets_table(coins: list, sort_by: str = "funding", limit: int = 20):
     """Render assets table."""
-    # Sort
-    if sort_by == "funding":
-        coins.sort(key=lambda x: x.get("funding", 0), reverse=True)
-    elif sort_by == "volume":
-        coins.sort(key=lambda x: x.get("dayNtlVlm", 0), reverse=True)
-    elif sort_by == "oi":
-        coins.sort(key=lambda x: x.get("openInterest", 0), reverse=True)
+    # Pick the top rows without sorting (or mutating) the whole list
+    sort_key = _ASSET_SORT_KEYS.get(sort_by)
+    if sort_key:
+        # Pull the key into a flat column once; ranking indices by vals.__getitem__
+        # keeps the comparison key in C instead of a Python lambda per coin
+        vals = [c.get(sort_key, 0) for c in coins]
+        top = [coins[i] for i in heapq.nlargest(limit, range(len(vals)), key=vals.__getitem__)]
+    else:
+        top = coins[:limit]
     
     # Display
     table = Table(title="Hyperliquid Perpetuals")
@@ -28,61 +57,65 @@ def render_assets_table(coins: list, sort_by: str = "funding", limit: int = 20):
     table.add_column("Max Lev", justify="right")
     table.add_column("24h Volume", justify="right")
     
-    for coin in coins[:limit]:
-        funding = coin.get("funding", 0)
-        funding_str = f"{funding:.6f}" if funding else "N/A"
-        table.add_row(
+    rows = [
+        (
             coin["coin"],
-            funding_str,
-            f"{coin.get('markPx', 0):.4f}",
-            f"{coin.get('midPx', 0):.4f}",
-            f"{coin.get('oraclePx', 0):.4f}",
+            f"{coin.get('funding', 0):.6f}" if coin.get("funding", 0) else "N/A",
+            _px(coin.get("markPx", 0)),
+            _px(coin.get("midPx", 0)),
+            _px(coin.get("oraclePx", 0)),
             str(coin.get("maxLeverage", 0)),
             f"{coin.get('dayNtlVlm', 0):,.0f}",
         )
+        for coin in top
+    ]
+    add_row = table.add_row
+    for row in rows:
+        add_row(*row)
     
     console.print(table)
 
 
 def render_status_table(state: State):
     """Render status table."""
-    from rich.panel import Panel
-    
-    console.print(Panel("[bold]Farming Plan[/bold]", style="cyan"))
-    print_plan(state.plan)
-    
-    console.print("\n" + Panel("[bold]Statistics[/bold]", style="cyan"))
     stats_table = Table(show_header=False, box=None)
     stats_table.add_column("Metric", style="cyan")
     stats_table.add_column("Value", style="yellow", justify="right")
     
     remaining_volume = max(0, state.plan.target_volume - state.stats.total_volume_done)
-    stats_table.add_row("Total Volume Done", f"${state.stats.total_volume_done:,.2f}")
-    stats_table.add_row("Target Volume", f"${state.plan.target_volume:,.2f}")
-    stats_table.add_row("Remaining Volume", f"${remaining_volume:,.2f}")
-    stats_table.add_row("Total Fees Paid", f"${state.stats.total_fees:.2f}")
-    stats_table.add_row("Total Funding PnL", f"${state.stats.total_funding_pnl:.2f}")
-    stats_table.add_row("Net PnL", f"${state.stats.total_funding_pnl - state.stats.total_fees:.2f}")
+    stats_table.add_row("Total Volume Done", "$" + _money(state.stats.total_volume_done))
+    stats_table.add_row("Target Volume", "$" + _money(state.plan.target_volume))
+    stats_table.add_row("Remaining Volume", "$" + _money(remaining_volume))
+    stats_table.add_row("Total Fees Paid", "$" + _money(state.stats.total_fees))
+    stats_table.add_row("Total Funding PnL", "$" + _money(state.stats.total_funding_pnl))
+    stats_table.add_row("Net PnL", "$" + _money(state.stats.total_funding_pnl - state.stats.total_fees))
     
     # Calculate how many more trades needed
-    from ..services.calc import roundtrips_needed, calculate_volume
-    
     if state.plan.default_margin > 0 and state.plan.default_leverage > 0:
         notional_per_trade = state.plan.default_margin * state.plan.default_leverage
         trades_needed = roundtrips_needed(remaining_volume, notional_per_trade)
         stats_table.add_row("Trades Needed (est.)", str(trades_needed))
     
-    console.print(stats_table)
+    parts = [_PLAN_HEADER, build_plan_table(state.plan), "", _STATS_HEADER, stats_table]
     
     # Active trades
     active_trades = [t for t in state.trades if t.close_price is None]
     if active_trades:
-        render_trades_table(active_trades, title="Active Trades")
+        parts.append(f"\n[bold]Active Trades: {len(active_trades)}[/bold]")
+        parts.append(_build_trades_table(active_trades))
+    
+    # One print so Rich lays out and flushes the whole status view once
+    console.print(Group(*parts))
 
 
 def render_trades_table(trades: list[Trade], title: str = "Trades"):
     """Render trades table."""
     console.print(f"\n[bold]{title}: {len(trades)}[/bold]")
+    console.print(_build_trades_table(trades))
+
+
+def _build_trades_table(trades: list[Trade]) -> Table:
+    """Build the trades table without printing it."""
     trades_table = Table()
     trades_table.add_column("ID", style="cyan")
     trades_table.add_column("Coin", style="yellow")
@@ -91,14 +124,19 @@ def render_trades_table(trades: list[Trade], title: str = "Trades"):
     trades_table.add_column("Open Price", justify="right")
     trades_table.add_column("Hold Min", justify="right")
     
-    for trade in trades:
-        trades_table.add_row(
-            trade.id,
-            trade.coin,
-            trade.side,
-            f"${trade.notional:,.2f}",
-            f"${trade.open_price:.4f}" if trade.open_price else "N/A",
-            str(trade.planned_hold_min),
+    rows = [
+        (
+            t.id,
+            t.coin,
+            t.side,
+            "$" + _money(t.notional),
+            "$" + _px(t.open_price) if t.open_price else "N/A",
+            str(t.planned_hold_min),
         )
-    console.print(trades_table)
+        for t in trades
+    ]
+    add_row = trades_table.add_row
+    for row in rows:
+        add_row(*row)
+    return trades_table
 
@@ -0,0 +1,35 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+# Variables read by Settings.from_env; cleared so host config cannot leak into tests
+_SETTINGS_ENV_VARS = (
+    "HL_INFO_URL",
+    "FARM_STATE_PATH",
+    "WATCH_STATE_PATH",
+    "COINGECKO_CACHE_PATH",
+    "COINGECKO_CACHE_TTL_SEC",
+    "DEFAULT_TAKER_FEE",
+    "DEFAULT_MAKER_FEE",
+    "TELEGRAM_BOT_TOKEN",
+    "TELEGRAM_CHAT_ID",
+    "TELEGRAM_PARSE_MODE",
+    "TELEGRAM_OWNER_ID",
+    "TELEGRAM_ALLOWED_CHAT_ID",
+    "TELEGRAM_WEBHOOK_URL",
+    "TELEGRAM_SECRET_TOKEN",
+    "TELEGRAM_CONTROL_PLANE",
+    "PROPOSAL_EXPIRY_MINUTES",
+    "TELEGRAM_SPAM_GUARD_SEC",
+    "POLL_INTERVAL_FLOOR_SEC",
+    "META_CACHE_TTL_SEC",
+)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _clean_env():
+    """Remove settings environment variables once for the whole session."""
+    with pytest.MonkeyPatch.context() as mp:
+        for name in _SETTINGS_ENV_VARS:
+            mp.delenv(name, raising=False)
+        yield
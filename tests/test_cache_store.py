@@ -0,0 +1,126 @@
+"""Tests for the file-based cache."""
+
+import json
+import os
+import time
+
+from farmcalc.storage import _json
+from farmcalc.storage.cache_store import CacheStore
+
+
+def test_set_get_roundtrip(tmp_path):
+    """Test that values survive a round trip through the shard files."""
+    cache = CacheStore(tmp_path / "cache", ttl_sec=60)
+    cache.set("meta", {"universe": [1, 2, 3]})
+    
+    assert cache.get("meta") == {"universe": [1, 2, 3]}
+    assert CacheStore(tmp_path / "cache", ttl_sec=60).get("meta") == {"universe": [1, 2, 3]}
+    assert cache.get("missing") is None
+
+
+def test_expired_entry_returns_none(tmp_path):
+    """Test that entries older than the TTL are ignored."""
+    cache = CacheStore(tmp_path, ttl_sec=60)
+    cache._key_path("meta").write_text(json.dumps({"key": "meta", "value": 1, "timestamp": 0}))
+    
+    assert cache.get("meta") is None
+
+
+def test_set_writes_only_its_own_shard(tmp_path):
+    """Test that setting one key leaves other keys' files untouched."""
+    cache = CacheStore(tmp_path, ttl_sec=60)
+    cache.set("a", 1)
+    a_path = cache._key_path("a")
+    before = a_path.stat().st_mtime_ns
+    
+    cache.set("b", 2)
+    
+    assert a_path.stat().st_mtime_ns == before
+    assert cache._key_path("b") != a_path
+    assert cache.get("a") == 1 and cache.get("b") == 2
+
+
+def test_get_serves_from_memory_until_file_changes(tmp_path):
+    """Test that a shard is only re-parsed after it changes on disk."""
+    cache = CacheStore(tmp_path, ttl_sec=60)
+    cache.set("a", 1)
+    
+    first = cache._entry("a")
+    assert cache._entry("a") is first
+    
+    # Another process rewrites the key
+    CacheStore(tmp_path, ttl_sec=60).set("a", 2)
+    path = cache._key_path("a")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    
+    assert cache.get("a") == 2
+
+
+def test_set_evicts_expired_shards(tmp_path):
+    """Test that set() removes shard files older than the TTL."""
+    CacheStore(tmp_path, ttl_sec=60).set("stale", 1)
+    cache = CacheStore(tmp_path, ttl_sec=60)
+    stale_path = cache._key_path("stale")
+    old = time.time() - 3600
+    os.utime(stale_path, (old, old))
+    
+    cache.set("fresh", 2)
+    
+    assert not stale_path.exists()
+    assert cache.get("fresh") == 2
+
+
+def test_eviction_runs_at_most_once_per_ttl(tmp_path, monkeypatch):
+    """Test that repeated set() calls within the TTL scan the directory once."""
+    cache = CacheStore(tmp_path, ttl_sec=60)
+    sweeps = []
+    monkeypatch.setattr(cache, "_evict_expired", sweeps.append)
+    
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert len(sweeps) == 1
+    
+    cache._next_eviction = 0.0
+    cache.set("c", 3)
+    assert len(sweeps) == 2
+
+
+def test_cache_file_is_compact_unless_pretty(tmp_path, monkeypatch):
+    """Test that store files are written without indentation by default."""
+    cache = CacheStore(tmp_path, ttl_sec=60)
+    cache.set("meta", {"a": 1})
+    assert b"\n" not in cache._key_path("meta").read_bytes()
+    
+    monkeypatch.setattr(_json, "_PRETTY", True)
+    cache.set("meta", {"a": 2})
+    assert cache._key_path("meta").read_bytes().startswith(b'{\n  "key"')
+
+
+def test_eviction_keeps_unrelated_files(tmp_path):
+    """Test that eviction only removes files that are this cache's shards."""
+    cache = CacheStore(tmp_path, ttl_sec=60)
+    other_json = tmp_path / "settings.json"
+    other_json.write_text("{}")
+    lookalike = tmp_path / ("0" * 16 + ".json")
+    lookalike.write_text(json.dumps({"key": "not-this-digest", "value": 1, "timestamp": 0}))
+    old = time.time() - 3600
+    for path in (other_json, lookalike):
+        os.utime(path, (old, old))
+    
+    cache.set("fresh", 1)
+    
+    assert other_json.exists()
+    assert lookalike.exists()
+
+
+def test_legacy_file_path_uses_parent_dir(tmp_path):
+    """Test that a path to the old single-file cache still caches."""
+    legacy = tmp_path / "coingecko_cache.json"
+    legacy.write_text("{}")
+    cache = CacheStore(legacy, ttl_sec=60)
+    cache.set("meta", 1)
+    
+    assert cache.cache_dir == tmp_path
+    assert cache.get("meta") == 1
+    assert legacy.read_text() == "{}"
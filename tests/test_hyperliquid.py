@@ -0,0 +1,51 @@
+"""Tests for the Hyperliquid client."""
+
+import asyncio
+import json
+
+import httpx
+
+from farmcalc.clients.hyperliquid import HyperliquidClient
+from farmcalc.settings import Settings
+
+
+def _book_handler(request: httpx.Request) -> httpx.Response:
+    """Serve a one-level book per coin, failing for coin "BAD"."""
+    coin = json.loads(request.content)["coin"]
+    if coin == "BAD":
+        return httpx.Response(500)
+    px = {"BTC": 100.0, "ETH": 10.0}[coin]
+    return httpx.Response(200, json={"levels": [[{"px": str(px - 0.5)}], [{"px": str(px + 0.5)}]]})
+
+
+def test_get_l2_books_batch_keeps_coin_order():
+    """Test that concurrent fetches come back aligned with the input coins."""
+    client = HyperliquidClient(Settings())
+    client.async_client = httpx.AsyncClient(transport=httpx.MockTransport(_book_handler))
+    
+    books = client.get_l2_books_batch(["ETH", "BAD", "BTC"])
+    
+    assert [b["mid"] if b else None for b in books] == [10.0, None, 100.0]
+
+
+def test_get_l2_books_batch_returns_partial_results_on_timeout(monkeypatch):
+    """Test that a batch past its deadline yields None for the slow coins."""
+    import farmcalc.clients.hyperliquid as hyperliquid
+    
+    monkeypatch.setattr(hyperliquid, "_HTTP_TIMEOUT_SEC", 0.2)
+    
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        if json.loads(request.content)["coin"] == "ETH":
+            await asyncio.sleep(5)
+        return _book_handler(request)
+    
+    client = HyperliquidClient(Settings())
+    client.async_client = httpx.AsyncClient(transport=httpx.MockTransport(slow_handler))
+    
+    books = client.get_l2_books_batch(["ETH", "BTC"])
+    client.close()
+    
+    assert books[0] is None
+    assert books[1]["mid"] == 100.0
+    assert client.async_client is None
+    assert client._loop is None
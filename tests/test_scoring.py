@@ -9,9 +9,11 @@ from farmcalc.services.scoring import (
     ScoreThresholds,
     ScoreWeights,
     calculate_component_scores,
+    calculate_deviation_bps_batch,
     calculate_mark_deviation_bps,
     calculate_oracle_deviation_bps,
     calculate_spread_bps,
+    calculate_spread_bps_batch,
     calculate_total_score,
     evaluate_safe_entry,
 )
@@ -35,6 +37,21 @@ def test_calculate_oracle_deviation_bps():
     assert dev == pytest.approx(10.0, rel=0.1)
 
 
+def test_batch_bps_match_scalar_versions():
+    """Test that the batch helpers agree with the per-coin functions."""
+    bids = [100.0, 0.0, 2.0]
+    asks = [100.1, 0.0, 2.002]
+    assert calculate_spread_bps_batch(bids, asks) == [
+        calculate_spread_bps(b, a) for b, a in zip(bids, asks)
+    ]
+    
+    prices = [100.05, 5.0, 1.9]
+    mids = [100.0, 0.0, 2.0]
+    assert calculate_deviation_bps_batch(prices, mids) == [
+        calculate_mark_deviation_bps(p, m) for p, m in zip(prices, mids)
+    ]
+
+
 def test_calculate_component_scores():
     """Test component score calculation."""
     thresholds = ScoreThresholds()
@@ -142,3 +159,48 @@ def test_evaluate_safe_entry_fails():
     # Should either fail or have low score
     if result:
         assert result.total_score < 50  # Low score for bad conditions
+
+
+def test_limiting_factors_lowest_scores_first():
+    """Test that limiting factors report the three weakest components in order."""
+    from farmcalc.services.scoring import _get_limiting_factors
+    
+    components = ScoreComponents(
+        spread_score=10.0,
+        mark_dev_score=90.0,
+        oracle_dev_score=50.0,
+        funding_score=30.0,
+        liquidity_score=95.0,
+        depth_score=40.0,
+    )
+    metrics = {"spread_bps": 9.5, "funding_abs": 0.00009, "depth_top": 2500.0}
+    
+    reasons = _get_limiting_factors(components, metrics, 80.0)
+    
+    assert reasons == [
+        "spread high (9.50 bps, score: 10.0)",
+        "funding high (0.000090, score: 30.0)",
+        "depth low ($2,500, score: 40.0)",
+    ]
+
+
+def test_calculate_depth_top_level_layouts():
+    """Test depth summing for list and dict level layouts."""
+    from farmcalc.services.scoring import _calculate_depth_top
+    
+    list_book = {"levels": [[[100.0, 1.0], [99.9, 2.0]], [[100.1, 3.0], [100.2, 4.0]]]}
+    dict_book = {"levels": [
+        [{"px": "100.0", "sz": "1.0"}, {"px": "99.9", "sz": "2.0"}],
+        [{"px": "100.1", "sz": "3.0"}, {"px": "100.2", "sz": "4.0"}],
+    ]}
+    
+    assert _calculate_depth_top(list_book, top_k=1) == pytest.approx(4.0)
+    assert _calculate_depth_top(dict_book, top_k=3) == pytest.approx(10.0)
+    assert _calculate_depth_top({}, top_k=3) == 5000.0  # default when no levels
+    
+    # Mixed layouts and malformed levels are summed per level, skipping bad ones
+    mixed_book = {"levels": [
+        [[100.0, 1.0], {"px": "99.9", "sz": "2.0"}, None],
+        [{"px": "100.1", "sz": "3.0"}, "bad", [100.2, 4.0]],
+    ]}
+    assert _calculate_depth_top(mixed_book, top_k=3) == pytest.approx(10.0)
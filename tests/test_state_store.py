@@ -0,0 +1,291 @@
+"""Tests for state persistence."""
+
+import json
+import math
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from farmcalc.models.domain import Proposal, ProposalStatus
+from farmcalc.storage import _json
+from farmcalc.storage.state_store import StateStore, WatchStateStore
+
+
+def test_load_cached_reuses_parsed_state(tmp_path):
+    """Test that load_cached only re-parses after a save."""
+    store = StateStore(tmp_path / "state.json")
+    store.save(store.load())
+
+    version1, state1 = store.load_cached()
+    version2, state2 = store.load_cached()
+    assert state1 is state2
+    assert version1 == version2
+
+    store.update_atomic(lambda s: setattr(s.stats, "total_fees", 1.5))
+    version3, state3 = store.load_cached()
+    assert version3 > version1
+    assert state3 is not state1
+    assert state3.stats.total_fees == 1.5
+
+
+def test_watch_load_cached_tracks_updates(tmp_path):
+    """Test that watch state cache is invalidated by atomic updates."""
+    store = WatchStateStore(tmp_path / "watch.json")
+    store.update_atomic(lambda ws: setattr(ws, "enabled", False))
+
+    _, watch_state = store.load_cached()
+    assert watch_state.enabled is False
+
+    store.update_atomic(lambda ws: setattr(ws, "enabled", True))
+    _, watch_state = store.load_cached()
+    assert watch_state.enabled is True
+
+
+def test_set_enabled_flag_overrides_saved_state(tmp_path):
+    """set_enabled flips the flag without rewriting the watch state file."""
+    store = WatchStateStore(tmp_path / "watch_state.json")
+    store.save(store.load())
+    mtime = store.state_path.stat().st_mtime_ns
+
+    assert store.is_enabled() is True
+    store.set_enabled(False)
+
+    assert store.is_enabled() is False
+    assert store.load().enabled is False
+    assert store.load_cached()[1].enabled is False
+    assert store.state_path.stat().st_mtime_ns == mtime
+
+    store.set_enabled(True)
+    assert store.load().enabled is True
+
+
+def test_update_atomic_returns_callback_result(tmp_path):
+    """update_atomic hands back the callback's return value after saving."""
+    store = StateStore(tmp_path / "state.json")
+
+    def bump(state):
+        state.watcher_enabled = False
+        return "done", state.watcher_enabled
+
+    assert store.update_atomic(bump) == ("done", False)
+    assert store.load().watcher_enabled is False
+
+
+def test_alert_minute_buckets_count_last_hour(tmp_path):
+    """Alert hour counter drops buckets older than 60 minutes and persists."""
+    store = WatchStateStore(tmp_path / "watch_state.json")
+    state = store.load()
+    base = 1_700_000_000.0
+
+    state.record_alert(base)
+    state.record_alert(base + 30)
+    state.record_alert(base + 1800)
+    assert state.alerts_last_hour(base + 1800) == 3
+    assert state.alerts_last_hour(base + 3700) == 1
+    assert state.alerts_last_hour(base + 7200) == 0
+
+    store.save(state)
+    assert store.load().alerts_last_hour(base + 1800) == 3
+
+    state.record_alert(base + 3700)
+    assert state.alerts_last_hour(base + 3700) == 2
+
+
+def test_peek_next_expiry_tracks_pending_proposals(tmp_path):
+    """next_expiry_ts is recomputed on save from pending proposals only."""
+    store = StateStore(tmp_path / "state.json")
+    state = store.load()
+    store.save(state)
+    assert store.peek_next_expiry() == math.inf
+
+    expires = datetime.now(timezone.utc) + timedelta(minutes=15)
+    state.proposals["p1"] = Proposal(
+        id="p1", coin="BTC", side="LONG", score=80.0, reasons=[], metrics={},
+        suggested_prices={}, offsets={}, fill_probs={}, margin=100.0, leverage=10.0,
+        hold_min=60, fee_mode="maker", funding_kind="hourly", funding_raw=0.0,
+        funding_hourly=0.0, created_at=datetime.now(timezone.utc).isoformat(),
+        expires_at=expires.isoformat(),
+    )
+    store.save(state)
+    assert store.peek_next_expiry() == expires.timestamp()
+
+    state.proposals["p1"].status = ProposalStatus.REJECTED
+    store.save(state)
+    assert store.peek_next_expiry() == math.inf
+
+
+def test_set_enabled_coalesces_repeats(tmp_path):
+    """Repeated pause/resume taps only write the flag file once."""
+    store = WatchStateStore(tmp_path / "watch_state.json")
+
+    assert store.set_enabled(False) is True
+    assert store.set_enabled(False) is False
+
+    # A write from another store instance invalidates the memo
+    WatchStateStore(store.state_path).set_enabled(True)
+    assert store.set_enabled(False) is True
+    assert store.is_enabled() is False
+
+
+def test_failed_save_keeps_previous_file(tmp_path, monkeypatch):
+    """Test that a save interrupted mid-write leaves the old state intact."""
+    store = StateStore(tmp_path / "state.json")
+    store.update_atomic(lambda s: setattr(s.stats, "total_fees", 2.5))
+
+    def _boom(data):
+        raise OSError("disk full")
+
+    state = store.load()
+    state.stats.total_fees = 9.0
+    monkeypatch.setattr(_json, "dumps", _boom)
+    with pytest.raises(OSError):
+        store.save(state)
+    monkeypatch.undo()
+
+    assert store.load().stats.total_fees == 2.5
+
+
+def _pending_proposal(pid: str) -> Proposal:
+    """Build a pending proposal that expires in five minutes."""
+    now = datetime.now(timezone.utc)
+    return Proposal(
+        id=pid, coin="BTC", side="LONG", score=90.0, reasons=[], metrics={},
+        suggested_prices={}, offsets={}, fill_probs={}, margin=100.0, leverage=10.0,
+        hold_min=60, fee_mode="maker", funding_kind="hourly", funding_raw=0.0,
+        funding_hourly=0.0, created_at=now.isoformat(),
+        expires_at=(now + timedelta(minutes=5)).isoformat(),
+    )
+
+
+def test_update_atomic_appends_deltas_and_replays(tmp_path):
+    """Test that updates go to the delta log and load() replays them."""
+    store = StateStore(tmp_path / "state.json")
+    state = store.load()
+    for i in range(5):
+        state.proposals[f"old{i}"] = _pending_proposal(f"old{i}")
+    store.save(state)
+    snapshot = store.state_path.read_bytes()
+
+    store.update_atomic(lambda s: s.proposals.__setitem__("p1", _pending_proposal("p1")))
+    store.update_atomic(lambda s: setattr(s.proposals["p1"], "status", ProposalStatus.REJECTED))
+
+    assert store.state_path.read_bytes() == snapshot
+    assert len(store.log_path.read_bytes().splitlines()) == 2  # one upsert per update
+
+    loaded = StateStore(tmp_path / "state.json").load()
+    assert loaded.proposals["p1"].status is ProposalStatus.REJECTED
+    assert len(loaded.proposals) == 6
+
+    # A full save folds the log into the snapshot
+    store.save(loaded)
+    assert not store.log_path.exists()
+    assert store.load().proposals["p1"].status is ProposalStatus.REJECTED
+
+
+def test_torn_log_record_is_ignored(tmp_path):
+    """Test that a partially written last log line does not break loading."""
+    store = StateStore(tmp_path / "state.json")
+    store.update_atomic(lambda s: None)
+    store.update_atomic(lambda s: setattr(s.stats, "total_fees", 3.0))
+    with open(store.log_path, "ab") as f:
+        f.write(b'{"op": "set", "key": "stats", "val')
+
+    assert store.load().stats.total_fees == 3.0
+
+
+def test_update_atomic_serializes_threads(tmp_path):
+    """Test that threads sharing the store's lock descriptor still exclude each other."""
+    store = StateStore(tmp_path / "state.json")
+    store.update_atomic(lambda s: None)
+
+    def bump(s):
+        s.stats.total_fees += 1.0
+
+    def worker():
+        for _ in range(10):
+            store.update_atomic(bump)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert store.load().stats.total_fees == 40.0
+
+
+def test_update_atomic_persists_in_place_nested_edits(tmp_path):
+    """Test that mutating a proposal's nested dict in place still reaches the log."""
+    store = StateStore(tmp_path / "state.json")
+    state = store.load()
+    for i in range(5):
+        state.proposals[f"old{i}"] = _pending_proposal(f"old{i}")
+    store.save(state)
+
+    store.update_atomic(lambda s: s.proposals["old0"].metrics.__setitem__("edge_bps", 4.5))
+
+    assert store.log_path.exists()
+    assert StateStore(store.state_path).load().proposals["old0"].metrics == {"edge_bps": 4.5}
+
+
+def test_update_atomic_skips_unchanged_nan_records(tmp_path):
+    """Test that a record holding NaN is not rewritten when fn leaves it alone."""
+    store = StateStore(tmp_path / "state.json")
+    state = store.load()
+    for i in range(5):
+        state.proposals[f"old{i}"] = _pending_proposal(f"old{i}")
+    state.proposals["old0"].metrics = {"edge_bps": float("nan")}
+    store.save(state)
+
+    store.update_atomic(lambda s: setattr(s.stats, "total_fees", 1.0))
+
+    records = [json.loads(line) for line in store.log_path.read_bytes().splitlines()]
+    assert [r["op"] for r in records] == ["set"]
+
+
+def test_missing_next_expiry_is_recomputed_and_persisted(tmp_path):
+    """Test that a snapshot without next_expiry_ts gets the recomputed value written back."""
+    store = StateStore(tmp_path / "state.json")
+    state = store.load()
+    state.proposals["p1"] = _pending_proposal("p1")
+    store.save(state)
+    data = json.loads(store.state_path.read_text())
+    del data["next_expiry_ts"]
+    store.state_path.write_text(json.dumps(data))
+
+    expected = datetime.fromisoformat(state.proposals["p1"].expires_at).timestamp()
+    assert store.load().next_expiry_ts == expected
+
+    store.update_atomic(lambda s: None)
+
+    assert StateStore(store.state_path)._load_with_meta()[2] == expected
+
+
+def test_peek_next_expiry_reads_sidecar_only(tmp_path, monkeypatch):
+    """Test that the peek falls back to a read-only load, then uses the sidecar."""
+    store = StateStore(tmp_path / "state.json")
+    state = store.load()
+    state.proposals["p1"] = _pending_proposal("p1")
+    store.save(state)
+    data = json.loads(store.state_path.read_text())
+    del data["next_expiry_ts"]
+    store.state_path.write_text(json.dumps(data))
+    store.expiry_path.unlink()
+    snapshot = store.state_path.read_bytes()
+
+    expected = datetime.fromisoformat(state.proposals["p1"].expires_at).timestamp()
+    assert store.peek_next_expiry() == expected
+    assert not store.expiry_path.exists()
+    assert store.state_path.read_bytes() == snapshot
+
+    # The next write persists the sidecar, after which peeks skip the state
+    store.update_atomic(lambda s: None)
+    assert json.loads(store.expiry_path.read_text()) == expected
+
+    def _no_load():
+        raise AssertionError("peek parsed the full state")
+
+    fresh = StateStore(store.state_path)
+    monkeypatch.setattr(fresh, "load", _no_load)
+    assert fresh.peek_next_expiry() == expected
@@ -1,151 +1,290 @@
 """Tests for Telegram control plane."""
 
+import copy
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from farmcalc.models.domain import Proposal, ProposalStatus, State, WatchState
+from farmcalc.models.domain import (
+    Plan,
+    Proposal,
+    ProposalStatus,
+    State,
+    Stats,
+    Trade,
+    WatchState,
+)
 from farmcalc.services.proposals import accept_proposal, reject_proposal
-from farmcalc.services.telegram_control import is_owner
+from farmcalc.services.telegram_control import (
+    handle_callback_query,
+    handle_message,
+    is_owner,
+    parse_update,
+)
 from farmcalc.settings import Settings
+from farmcalc.storage.state_store import StateStore, WatchStateStore
+
+PENDING = ProposalStatus.PENDING
+ACCEPTED = ProposalStatus.ACCEPTED
+REJECTED = ProposalStatus.REJECTED
+
+# Fixed timestamps far enough ahead that accept_proposal never sees the proposal as expired
+_CREATED = datetime(2099, 1, 1, tzinfo=timezone.utc)
+NOW_ISO = _CREATED.isoformat()
+EXPIRES_ISO = (_CREATED + timedelta(minutes=15)).isoformat()
+
+# Field values for every test proposal; override per test via make_proposal.
+# make_proposal deep-copies these, so each proposal gets its own containers.
+DEFAULTS = {
+    "id": "TEST_PROPOSAL",
+    "coin": "BTC",
+    "side": "LONG",
+    "score": 85.0,
+    "reasons": ["spread ok"],
+    "metrics": {},
+    "suggested_prices": {"open_limit_px": 100.0, "close_limit_px": 101.0},
+    "offsets": {"open_offset_bps": 10.0, "close_offset_bps": 10.0},
+    "fill_probs": {"open_fill_prob": 0.8, "close_fill_prob": 0.8},
+    "margin": 100.0,
+    "leverage": 10.0,
+    "hold_min": 60,
+    "fee_mode": "maker",
+    "funding_kind": "hourly",
+    "funding_raw": 0.00001,
+    "funding_hourly": 0.00001,
+    "created_at": NOW_ISO,
+    "expires_at": EXPIRES_ISO,
+    "status": PENDING,
+}
 
 
 @pytest.fixture
 def settings_with_owner():
     """Settings with owner ID."""
-    settings = Settings()
-    settings.telegram_owner_id = 123456789
-    settings.telegram_allowed_chat_id = None
-    return settings
+    return Settings(telegram_owner_id=123456789)
 
 
 @pytest.fixture
 def settings_with_chat_restriction():
     """Settings with owner ID and chat restriction."""
-    settings = Settings()
-    settings.telegram_owner_id = 123456789
-    settings.telegram_allowed_chat_id = "-987654321"
-    return settings
-
-
-def test_is_owner_valid(settings_with_owner):
-    """Test owner check with valid owner ID."""
-    assert is_owner(123456789, None, settings_with_owner) is True
-    assert is_owner(123456789, -123456789, settings_with_owner) is True
-
-
-def test_is_owner_invalid(settings_with_owner):
-    """Test owner check with invalid owner ID."""
-    assert is_owner(999999999, None, settings_with_owner) is False
-
-
-def test_is_owner_chat_restriction(settings_with_chat_restriction):
-    """Test owner check with chat ID restriction."""
-    # Valid owner, valid chat
-    assert is_owner(123456789, -987654321, settings_with_chat_restriction) is True
-    
-    # Valid owner, wrong chat
-    assert is_owner(123456789, -111111111, settings_with_chat_restriction) is False
-    
-    # Invalid owner, valid chat
-    assert is_owner(999999999, -987654321, settings_with_chat_restriction) is False
-
-
-def test_accept_proposal_idempotent():
-    """Test that accepting a proposal twice is idempotent."""
-    from farmcalc.services.proposals import accept_proposal
-    from farmcalc.settings import Settings
-    
-    settings = Settings()
-    settings.default_taker_fee = 0.00045
-    settings.default_maker_fee = 0.00015
-    
-    state = State(
-        plan=Plan(),
-        stats=Stats(),
-        trades=[],
-        proposals={},
-    )
-    
-    # Create a proposal
-    proposal = Proposal(
-        id="TEST_BTC_LONG_123",
-        coin="BTC",
-        side="LONG",
-        score=85.0,
-        reasons=["spread ok"],
-        metrics={},
-        suggested_prices={"open_limit_px": 100.0, "close_limit_px": 101.0},
-        offsets={"open_offset_bps": 10.0, "close_offset_bps": 10.0},
-        fill_probs={"open_fill_prob": 0.8, "close_fill_prob": 0.8},
-        margin=100.0,
-        leverage=10.0,
-        hold_min=60,
-        fee_mode="maker",
-        funding_kind="hourly",
-        funding_raw=0.00001,
-        funding_hourly=0.00001,
-        created_at=datetime.now(timezone.utc).isoformat(),
-        expires_at=(datetime.now(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=15)).isoformat(),
-        status=ProposalStatus.PENDING.value,
-    )
-    
-    state.proposals[proposal.id] = proposal
-    
-    # First accept
-    trade1 = accept_proposal(state, proposal.id, 123456789, settings)
-    assert trade1 is not None
-    assert proposal.status == ProposalStatus.ACCEPTED.value
-    assert proposal.decision == "ACCEPT"
-    
-    # Second accept (should be idempotent)
-    trade2 = accept_proposal(state, proposal.id, 123456789, settings)
-    assert trade2 is None  # Already handled
-    assert proposal.status == ProposalStatus.ACCEPTED.value  # Still accepted
-
-
-def test_reject_proposal_idempotent():
-    """Test that rejecting a proposal twice is idempotent."""
-    from farmcalc.services.proposals import reject_proposal
-    
-    state = State(
-        plan=Plan(),
-        stats=Stats(),
-        trades=[],
-        proposals={},
-    )
-    
-    proposal = Proposal(
-        id="TEST_BTC_LONG_123",
-        coin="BTC",
-        side="LONG",
-        score=85.0,
-        reasons=[],
-        metrics={},
-        suggested_prices={},
-        offsets={},
-        fill_probs={},
-        margin=100.0,
-        leverage=10.0,
-        hold_min=60,
-        fee_mode="maker",
-        funding_kind="hourly",
-        funding_raw=0.0,
-        funding_hourly=0.0,
-        created_at=datetime.now(timezone.utc).isoformat(),
-        expires_at=(datetime.now(timezone.utc) + timedelta(minutes=15)).isoformat(),
-        status=ProposalStatus.PENDING.value,
-    )
-    
-    state.proposals[proposal.id] = proposal
-    
-    # First reject
-    result1 = reject_proposal(state, proposal.id, 123456789)
-    assert result1 is True
-    assert proposal.status == ProposalStatus.REJECTED.value
-    assert proposal.decision == "REJECT"
-    
-    # Second reject (should be idempotent)
-    result2 = reject_proposal(state, proposal.id, 123456789)
-    assert result2 is False  # Already handled
-    assert proposal.status == ProposalStatus.REJECTED.value  # Still rejected
+    return Settings(telegram_owner_id=123456789, telegram_allowed_chat_id="-987654321")
+
+
+@pytest.fixture
+def make_proposal():
+    """Factory building a Proposal from DEFAULTS with keyword overrides."""
+    return lambda **over: Proposal(**{**copy.deepcopy(DEFAULTS), **over})
+
+
+@pytest.fixture
+def proposal(make_proposal):
+    """A fresh pending proposal for each test."""
+    return make_proposal(id="TEST_BTC_LONG_123")
+
+
+@pytest.fixture
+def fresh_state():
+    """Empty application state, rebuilt for every test."""
+    return State(plan=Plan(), stats=Stats(), trades=[], proposals={})
+
+
+@pytest.mark.parametrize(
+    "user_id,chat_id,restricted,expected",
+    [
+        (123456789, None, False, True),
+        (123456789, -123456789, False, True),
+        (999999999, None, False, False),
+        # Chat restriction: valid chat, wrong chat, invalid owner
+        (123456789, -987654321, True, True),
+        (123456789, -111111111, True, False),
+        (999999999, -987654321, True, False),
+    ],
+)
+def test_is_owner(
+    user_id, chat_id, restricted, expected, settings_with_owner, settings_with_chat_restriction
+):
+    """Test owner check across owner IDs and chat restrictions."""
+    settings = settings_with_chat_restriction if restricted else settings_with_owner
+    assert is_owner(user_id, chat_id, settings) is expected
+
+
+def test_is_owner_non_numeric_chat_restriction(settings_with_owner):
+    """Test that an unparseable chat restriction refuses every chat."""
+    settings_with_owner.telegram_allowed_chat_id = "@mychannel"
+    
+    assert is_owner(123456789, -987654321, settings_with_owner) is False
+    assert is_owner(123456789, None, settings_with_owner) is False
+
+
+def _twice(op, *args):
+    """Call op twice with the same arguments and return both results."""
+    return op(*args), op(*args)
+
+
+_DECISION_OPS = {
+    "accept": lambda state, pid, settings: accept_proposal(state, pid, 123456789, settings),
+    "reject": lambda state, pid, settings: reject_proposal(state, pid, 123456789),
+}
+
+
+@pytest.mark.parametrize(
+    "op,first_ok,repeat_result",
+    [
+        ("accept", lambda r: isinstance(r, Trade), None),
+        ("reject", lambda r: r is True, False),
+    ],
+)
+def test_decision_idempotent(
+    op, first_ok, repeat_result, proposal, fresh_state, settings_with_owner
+):
+    """Test that accepting or rejecting a proposal twice is idempotent."""
+    decide = _DECISION_OPS[op]
+    fresh_state.proposals[proposal.id] = proposal
+    
+    first, second = _twice(decide, fresh_state, proposal.id, settings_with_owner)
+    assert first_ok(first)
+    assert second is repeat_result
+
+
+@pytest.mark.parametrize(
+    "op,expected_status,decision",
+    [
+        ("accept", ACCEPTED, "ACCEPT"),
+        ("reject", REJECTED, "REJECT"),
+    ],
+)
+def test_decision_status_contract(
+    op, expected_status, decision, proposal, fresh_state, settings_with_owner
+):
+    """Test that a decided proposal keeps its status, decision and actor across repeats."""
+    decide = _DECISION_OPS[op]
+    fresh_state.proposals[proposal.id] = proposal
+    
+    _twice(decide, fresh_state, proposal.id, settings_with_owner)
+    
+    assert proposal.status is expected_status
+    assert proposal.decision == decision
+    assert proposal.decided_by_user_id == 123456789
+
 
+def test_proposal_is_slotted(make_proposal):
+    """Test that proposals carry no per-instance __dict__."""
+    assert not hasattr(make_proposal(), "__dict__")
+
+
+def test_accept_decided_proposal_skips_settings(make_proposal, fresh_state):
+    """Test that a repeat accept returns before reading settings."""
+    proposal = make_proposal(id="TEST_BTC_LONG_123", status=REJECTED)
+    fresh_state.proposals[proposal.id] = proposal
+    
+    assert accept_proposal(fresh_state, proposal.id, 123456789, None) is None
+    assert proposal.status is REJECTED
+
+
+class _RecordingClient:
+    """Minimal Telegram client stand-in that records sent messages."""
+    
+    def __init__(self):
+        self.sent = []
+    
+    def send_message(self, text, reply_markup=None, chat_id=None):
+        self.sent.append(text)
+        return True
+    
+    def answer_callback_query(self, callback_id, text=None, show_alert=False):
+        if text:
+            self.sent.append(text)
+        return True
+
+
+def test_handle_message_dispatch(tmp_path, settings_with_owner):
+    """Test that commands route through the handler table."""
+    client = _RecordingClient()
+    state_store = StateStore(tmp_path / "state.json")
+    watch_state_store = WatchStateStore(tmp_path / "watch.json")
+    
+    def message(text):
+        return {"message": {"text": text, "chat": {"id": 1}, "from": {"id": 123456789}}}
+    
+    assert handle_message(
+        message("/mutes"), state_store, watch_state_store, client, settings_with_owner
+    ) is True
+    assert client.sent == ["No active mutes."]
+    
+    assert handle_message(
+        message("/unknown"), state_store, watch_state_store, client, settings_with_owner
+    ) is False
+
+
+def test_status_message_renders_template(tmp_path, settings_with_owner):
+    """Test that /status fills every field of the status template."""
+    client = _RecordingClient()
+    state_store = StateStore(tmp_path / "state.json")
+    watch_state_store = WatchStateStore(tmp_path / "watch.json")
+    update = {"message": {"text": "/status", "chat": {"id": 1}, "from": {"id": 123456789}}}
+    
+    assert handle_message(update, state_store, watch_state_store, client, settings_with_owner) is True
+    
+    text = client.sent[0]
+    assert text.startswith("<b>📊 FarmCalc Status</b>\n")
+    assert "Enabled: ✅ Yes" in text
+    assert "Alerts (1h): 0" in text
+    assert "<b>Pending Proposals:</b> 0" in text
+    assert "{" not in text
+
+
+def test_parse_update_message_and_callback():
+    """Test single-pass extraction for both update kinds."""
+    view = parse_update({
+        "message": {
+            "message_id": 7,
+            "text": "/status",
+            "chat": {"id": 42},
+            "from": {"id": 123456789, "username": "owner"},
+        }
+    })
+    assert (view.user_id, view.chat_id, view.username, view.text) == (123456789, 42, "owner", "/status")
+    assert view.is_callback is False
+    
+    view = parse_update({
+        "callback_query": {
+            "id": "cb1",
+            "data": "PAUSE",
+            "from": {"id": 123456789},
+            "message": {"message_id": 9, "chat": {"id": 42}},
+        }
+    })
+    assert view.is_callback is True
+    assert (view.callback_id, view.callback_data, view.chat_id, view.message_id) == ("cb1", "PAUSE", 42, 9)
+    
+    assert parse_update({}).user_id is None
+
+
+def test_handle_callback_query_dispatch(tmp_path, settings_with_owner):
+    """Test that callback data routes on its prefix token."""
+    client = _RecordingClient()
+    state_store = StateStore(tmp_path / "state.json")
+    watch_state_store = WatchStateStore(tmp_path / "watch.json")
+    
+    def callback(data):
+        return {"callback_query": {"id": "cb", "data": data, "from": {"id": 123456789}, "message": {"chat": {"id": 1}}}}
+    
+    assert handle_callback_query(
+        callback("PAUSE"), state_store, watch_state_store, client, settings_with_owner
+    ) is True
+    assert watch_state_store.is_enabled() is False
+    
+    assert handle_callback_query(
+        callback("MUTE:BTC:15"), state_store, watch_state_store, client, settings_with_owner
+    ) is True
+    assert "BTC" in watch_state_store.load().muted_coins
+    assert client.sent == ["⏸ Watcher paused", "🔕 Muted BTC for 15m"]
+    
+    assert handle_callback_query(
+        callback("BOGUS:1"), state_store, watch_state_store, client, settings_with_owner
+    ) is False
+    
+    # Argument-less actions only match exactly; argument actions need one
+    for data in ("PAUSE:x", "ACCEPT"):
+        assert handle_callback_query(
+            callback(data), state_store, watch_state_store, client, settings_with_owner
+        ) is False
@@ -0,0 +1,108 @@
+"""Tests for the Telegram update queue."""
+
+import asyncio
+import threading
+
+from farmcalc.services.telegram_queue import TelegramUpdateQueue
+
+
+async def _drain(queue: TelegramUpdateQueue):
+    """Run the worker until every queued update has been handled."""
+    queue.start_worker()
+    await queue.join()
+    queue.stop_worker()
+
+
+def test_async_processor_runs_on_event_loop():
+    """Test that coroutine processors are awaited without a thread hop."""
+    seen = []
+    
+    async def processor(update):
+        seen.append((update["update_id"], threading.current_thread() is threading.main_thread()))
+    
+    async def run():
+        queue = TelegramUpdateQueue()
+        queue.set_processor(processor)
+        queue.enqueue({"update_id": 1})
+        await _drain(queue)
+        return queue.get_metrics()
+    
+    metrics = asyncio.run(run())
+    
+    assert seen == [(1, True)]
+    assert metrics["updates_processed"] == 1
+
+
+def test_sync_processor_runs_in_thread():
+    """Test that plain processors still run off the event loop thread."""
+    seen = []
+    
+    def processor(update):
+        seen.append(threading.current_thread() is threading.main_thread())
+    
+    async def run():
+        queue = TelegramUpdateQueue()
+        queue.set_processor(processor)
+        queue.enqueue({"update_id": 1})
+        await _drain(queue)
+    
+    asyncio.run(run())
+    
+    assert seen == [False]
+
+
+def test_worker_drains_ready_updates_in_one_batch():
+    """Test that a burst of updates is handled in a single thread hop."""
+    threads = []
+    
+    def processor(update):
+        threads.append(threading.get_ident())
+        if update["update_id"] == 2:
+            raise ValueError("boom")
+    
+    async def run():
+        queue = TelegramUpdateQueue()
+        queue.set_processor(processor)
+        for update_id in range(5):
+            queue.enqueue({"update_id": update_id})
+        await _drain(queue)
+        return queue.get_metrics()
+    
+    metrics = asyncio.run(run())
+    
+    assert len(threads) == 5
+    assert len(set(threads)) == 1
+    assert metrics["updates_processed"] == 4
+    assert metrics["processing_errors"] == 1
+    assert metrics["queue_depth"] == 0
+
+
+def test_enqueue_from_other_thread_wakes_worker():
+    """Test that updates enqueued off-loop are picked up by the worker."""
+    seen = []
+    
+    async def run():
+        queue = TelegramUpdateQueue(maxsize=2)
+        queue.set_processor(lambda update: seen.append(update["update_id"]))
+        queue.start_worker()
+        await asyncio.sleep(0)
+        
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.extend(queue.enqueue({"update_id": i}) for i in range(3))
+        )
+        thread.start()
+        thread.join()
+        
+        for _ in range(100):
+            if len(seen) == 2:
+                break
+            await asyncio.sleep(0.01)
+        queue.stop_worker()
+        return results, queue.get_metrics()
+    
+    results, metrics = asyncio.run(run())
+    
+    assert results == [True, True, False]
+    assert seen == [0, 1]
+    assert metrics["queue_drops"] == 1
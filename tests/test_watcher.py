@@ -0,0 +1,151 @@
+"""Tests for watcher service helpers."""
+
+import time
+
+from farmcalc.services.scoring import SafeEntryScore, ScoreComponents
+from farmcalc.services.watcher import WatcherService
+from farmcalc.settings import Settings
+from farmcalc.storage.state_store import StateStore, WatchStateStore
+
+
+def _make_watcher(tmp_path) -> WatcherService:
+    """Build a watcher with no network clients."""
+    return WatcherService(
+        hl_client=None,
+        telegram_client=None,
+        watch_state_store=WatchStateStore(tmp_path / "watch.json"),
+        state_store=StateStore(tmp_path / "state.json"),
+        settings=Settings(),
+    )
+
+
+def test_rebuild_universe_cache_picks_top_by_volume(tmp_path):
+    """Test that the universe is parsed once and top-N is re-derived on demand."""
+    watcher = _make_watcher(tmp_path)
+    universe = [{"name": "AAA"}, {"name": "BBB"}, {"name": "CCC"}, {"name": "DDD"}]
+    contexts = [
+        {"dayNtlVlm": "10", "funding": "0.0001", "markPx": "1.5"},
+        {"dayNtlVlm": 30.0, "funding": {"funding": "0.0002"}},
+        "not-a-dict",
+        {"dayNtlVlm": "bad", "funding": None},
+    ]
+    
+    watcher._rebuild_universe_cache(universe, contexts, top_n=2)
+    
+    assert [c["coin"] for c in watcher._top_coins] == ["BBB", "AAA"]
+    assert watcher._top_coins[0]["data"]["funding"] == 0.0002
+    assert watcher._top_coins[1]["data"]["markPx"] == 1.5
+    assert len(watcher._parsed_universe) == 3
+    
+    watcher._select_top_coins(5)
+    assert [c["coin"] for c in watcher._top_coins] == ["BBB", "AAA", "DDD"]
+
+
+class _FailingHLClient:
+    """Hyperliquid client stand-in whose market data fetch always fails."""
+    
+    def fetch_market_data(self):
+        raise RuntimeError("offline")
+    
+    def close(self):
+        pass
+
+
+def test_stop_wakes_sleeping_poll_loop(tmp_path):
+    """Test that stop() interrupts the poll loop's wait immediately."""
+    watcher = _make_watcher(tmp_path)
+    watcher.hl_client = _FailingHLClient()
+    watcher.get_state().config.poll_interval_sec = 30.0
+    
+    watcher.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    watcher.stop()
+    
+    assert not watcher._poll_thread.is_alive()
+    assert time.monotonic() - started < 2.0
+
+
+def test_fill_snapshots_flow_through_consumer_thread(tmp_path):
+    """Test that queued L2 snapshots reach the fill model before stop returns."""
+    watcher = _make_watcher(tmp_path)
+    watcher._start_fill_consumer()
+    
+    watcher._fill_queue.put(("BTC", 100.0, 99.99, 100.01, 2.0, 5000.0))
+    watcher._fill_queue.put(("BTC", 100.1, 100.09, 100.11, 2.0, 5000.0))
+    watcher._stop_fill_consumer()
+    
+    snapshots = watcher.fill_model.get_history("BTC").snapshots
+    assert [s["mid"] for s in snapshots] == [100.0, 100.1]
+    assert snapshots[0] == {"mid": 100.0, "bid": 99.99, "ask": 100.01, "spread": 2.0, "depth_top": 5000.0}
+    assert not watcher._fill_thread.is_alive()
+
+
+def test_check_rate_limit_sliding_window(tmp_path):
+    """Test that only alerts from the last hour count toward the limit."""
+    watcher = _make_watcher(tmp_path)
+    watcher._max_alerts_per_hour = 2
+    now = time.time()
+    
+    watcher._alert_times.extend([now - 7200, now - 3700, now - 60])
+    assert watcher._check_rate_limit() is True
+    assert watcher._alert_low == 2
+    
+    watcher._alert_times.append(now)
+    assert watcher._check_rate_limit() is False
+
+
+def test_check_rate_limit_counts_queued_alerts(tmp_path):
+    """Test that proposals waiting in the send queue count toward the limit."""
+    watcher = _make_watcher(tmp_path)
+    watcher._max_alerts_per_hour = 2
+    watcher._alert_times.append(time.time() - 60)
+    assert watcher._check_rate_limit() is True
+    
+    watcher._pending_alert_keys.add("BTC_LONG")
+    assert watcher._check_rate_limit() is False
+
+
+class _RecordingTelegram:
+    """Telegram client stand-in that records sent messages."""
+    
+    enabled = True
+    chat_id = "42"
+    
+    def __init__(self):
+        self.sent = []
+    
+    def send_message(self, text, reply_markup=None):
+        self.sent.append(text)
+        return True
+
+
+def test_sender_thread_sends_proposal_and_records_alert(tmp_path):
+    """Test that queued proposals are sent off the poll thread and recorded on success."""
+    watcher = _make_watcher(tmp_path)
+    watcher.telegram_client = _RecordingTelegram()
+    score = SafeEntryScore(
+        total_score=90.0,
+        component_scores=ScoreComponents(100.0, 100.0, 100.0, 100.0, 50.0, 50.0),
+        metrics={"safe_sides": [{"side": "LONG", "open_limit_px": 99.9, "close_limit_px": 100.1}]},
+        passed=True,
+        reasons=[],
+    )
+    now = time.time()
+    watcher._start_sender()
+    
+    queued = watcher._enqueue_proposal((
+        "BTC", "LONG", "BTC_LONG", now, "2026-01-01T00:00:00+00:00", score,
+        {"score": 90.0, "metrics": score.metrics, "reasons": []},
+        {"hold_min": 60, "fee_mode": "maker"},
+    ))
+    assert queued is True
+    assert "BTC_LONG" in watcher._pending_alert_keys
+    watcher._stop_sender()
+    
+    assert len(watcher.telegram_client.sent) == 1
+    assert "BTC LONG" in watcher.telegram_client.sent[0]
+    assert watcher._pending_alert_keys == set()
+    assert watcher.get_state().last_alert_ts["BTC_LONG"] == now
+    assert len(watcher.state_store.load().proposals) == 1
+    assert watcher.watch_state_store.load().last_alert_ts["BTC_LONG"] == now